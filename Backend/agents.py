@@ -1,24 +1,37 @@
 import os
 import re
 import json
+import asyncio
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, TypedDict, Annotated
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypedDict, Annotated
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, RemoveMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langgraph.graph import StateGraph, START, END
-from langgraph.prebuilt import ToolNode
+from langgraph.graph.message import add_messages
 from langgraph.checkpoint.memory import MemorySaver
 import uuid
-from database import get_db
+import database
+import fast_path
+import metrics
 import models
+import project_stats
+import queries
+from llm_cache import llm_cache, cache_key, task_tag
+from llm_provider import create_chat_model
+from coalesce import SingleFlight
+from checkpointer import create_checkpointer_from_env
+from context_builder import build_task_context
 import schemas
 
 
 class AgentState(TypedDict):
     """State shared across all agents"""
-    messages: Annotated[List, "Messages in the conversation"]
+    messages: Annotated[List, add_messages] # Conversation, appended to across requests of a thread
     user_id: str
     project_id: Optional[str]
     task_id: Optional[str]
@@ -27,6 +40,24 @@ class AgentState(TypedDict):
     result: Dict
 
 
+# Approximate token budget for task lists returned to the model by tools
+CONTEXT_TOKEN_BUDGET = int(os.getenv("AGENT_CONTEXT_TOKEN_BUDGET", "2000"))
+
+# Node names of the project manager graph, in execution order
+GRAPH_NODES = ("analyze", "execute", "tools", "finalize")
+
+
+def _messages_beyond_turns(messages: List, max_turns: int) -> List:
+    """
+    Messages older than the last `max_turns` user turns. Cuts only at a
+    HumanMessage, so tool calls are never separated from their results.
+    """
+    human_positions = [i for i, message in enumerate(messages) if isinstance(message, HumanMessage)]
+    if len(human_positions) <= max_turns:
+        return []
+    return messages[:human_positions[-max_turns]]
+
+
 class DatabaseTools:
     """Tools for database operations"""
     
@@ -35,45 +66,37 @@ class DatabaseTools:
     
     def get_user_projects_func(self, user_id: str) -> List[Dict]:
         """Get all projects for a user"""
-        user = self.db.query(models.User).filter(models.User.id == user_id).first()
-        if not user:
-            return []
-        
-        projects = []
-        for project in user.projects:
-            projects.append({
-                "id": project.id,
-                "name": project.name,
-                "description": project.description,
-                "task_count": len(project.tasks),
-                "completed_tasks": len([t for t in project.tasks if t.status == "done"])
-            })
-        return projects
+        rows = self.db.execute(queries.user_project_summaries(user_id)).all()
+        return [
+            {
+                "id": row.id,
+                "name": row.name,
+                "description": row.description,
+                "task_count": row.task_count,
+                "completed_tasks": row.completed_tasks
+            }
+            for row in rows
+        ]
     
     def get_project_tasks_func(self, project_id: str, status: Optional[str] = None) -> List[Dict]:
         """Get tasks for a project, optionally filtered by status"""
-        project = self.db.query(models.Project).filter(models.Project.id == project_id).first()
-        if not project:
-            return []
-        
-        tasks = project.tasks
-        if status:
-            tasks = [t for t in tasks if t.status == status]
-        
-        task_list = []
-        for task in tasks:
-            assignee_name = task.assignee.username if task.assignee else "Unassigned"
-            task_list.append({
-                "id": task.id,
-                "title": task.title,
-                "description": task.description,
-                "status": task.status,
-                "priority": task.priority,
-                "assigned_to": assignee_name,
-                "deadline": task.deadline.isoformat() if task.deadline else None,
-                "overdue": task.deadline < datetime.now() if task.deadline else False
-            })
-        return task_list
+        rows = self.db.execute(queries.project_task_rows(project_id, status)).all()
+        
+        now = datetime.now()
+        return [
+            {
+                "id": row.id,
+                "title": row.title,
+                "description": row.description,
+                "status": row.status,
+                "priority": row.priority,
+                "assigned_to": row.assignee_name or "Unassigned",
+                "deadline": row.deadline.isoformat() if row.deadline else None,
+                "overdue": row.deadline < now if row.deadline else False,
+                "updated_at": (row.updated_at or row.created_at).isoformat()
+            }
+            for row in rows
+        ]
     
     def create_task_func(self, project_id: str, title: str, description: str = "", 
                         priority: str = "medium", assigned_to_id: Optional[str] = None,
@@ -134,85 +157,131 @@ class DatabaseTools:
             self.db.rollback()
             return {"error": f"Failed to update task: {str(e)}"}
     
-    def get_overdue_tasks_func(self, user_id: str) -> List[Dict]:
-        """Get all overdue tasks for a user's projects"""
-        user = self.db.query(models.User).filter(models.User.id == user_id).first()
-        if not user:
-            return []
-        
-        overdue_tasks = []
-        for project in user.projects:
-            for task in project.tasks:
-                if task.deadline and task.deadline < datetime.now() and task.status != "done":
-                    overdue_tasks.append({
-                        "id": task.id,
-                        "title": task.title,
-                        "project": project.name,
-                        "deadline": task.deadline.isoformat(),
-                        "days_overdue": (datetime.now() - task.deadline).days,
-                        "assigned_to": task.assignee.username if task.assignee else "Unassigned"
-                    })
-        
-        return sorted(overdue_tasks, key=lambda x: x["days_overdue"], reverse=True)
-
-    # Create tool wrappers
-    @property
-    def get_user_projects(self):
-        @tool
-        def get_user_projects(user_id: str) -> List[Dict]:
-            """Get all projects for a user"""
-            return self.get_user_projects_func(user_id)
-        return get_user_projects
-    
-    @property
-    def get_project_tasks(self):
-        @tool
-        def get_project_tasks(project_id: str, status: Optional[str] = None) -> List[Dict]:
-            """Get tasks for a project, optionally filtered by status"""
-            return self.get_project_tasks_func(project_id, status)
-        return get_project_tasks
-    
-    @property
-    def create_task(self):
-        @tool
-        def create_task(project_id: str, title: str, description: str = "", 
-                       priority: str = "medium", assigned_to_id: Optional[str] = None,
-                       deadline_days: int = 7) -> Dict:
-            """Create a new task"""
-            return self.create_task_func(project_id, title, description, priority, assigned_to_id, deadline_days)
-        return create_task
-    
-    @property
-    def update_task_status(self):
-        @tool
-        def update_task_status(task_id: str, status: str) -> Dict:
-            """Update task status"""
-            return self.update_task_status_func(task_id, status)
-        return update_task_status
-    
-    @property
-    def get_overdue_tasks(self):
-        @tool
-        def get_overdue_tasks(user_id: str) -> List[Dict]:
-            """Get all overdue tasks for a user's projects"""
-            return self.get_overdue_tasks_func(user_id)
-        return get_overdue_tasks
+    def get_overdue_tasks_func(self, user_id: str, limit: int = 50, offset: int = 0) -> List[Dict]:
+        """Get overdue tasks for a user's projects, most overdue first"""
+        rows = self.db.execute(queries.overdue_tasks(user_id, datetime.now(), limit, offset)).all()
+        return [
+            {
+                "id": row.id,
+                "title": row.title,
+                "project": row.project,
+                "deadline": row.deadline.isoformat(),
+                "days_overdue": int(row.days_overdue),
+                "assigned_to": row.assignee_name or "Unassigned"
+            }
+            for row in rows
+        ]
+
+def _db_from_config(config: RunnableConfig) -> Session:
+    """Get the per-request database session injected through the graph config"""
+    return config["configurable"]["db"]
+
+
+# Tool wrappers are built once per process; the session comes from the run config
+@tool
+def get_user_projects(user_id: str, config: RunnableConfig) -> List[Dict]:
+    """Get all projects for a user"""
+    return DatabaseTools(_db_from_config(config)).get_user_projects_func(user_id)
+
+
+@tool
+def get_project_tasks(project_id: str, config: RunnableConfig, status: Optional[str] = None) -> Dict:
+    """Get the most relevant tasks for a project (optionally filtered by status), with counts for the rest"""
+    tasks = DatabaseTools(_db_from_config(config)).get_project_tasks_func(project_id, status)
+    task_context = build_task_context(tasks, CONTEXT_TOKEN_BUDGET)
+    if task_context["tokens_saved"]:
+        metrics.CONTEXT_TOKENS_SAVED.labels("get_project_tasks").inc(task_context["tokens_saved"])
+        metrics.CONTEXT_TASKS_DROPPED.labels("get_project_tasks").inc(task_context["omitted"]["count"])
+    return task_context
+
+
+@tool
+def create_task(project_id: str, title: str, config: RunnableConfig, description: str = "",
+                priority: str = "medium", assigned_to_id: Optional[str] = None,
+                deadline_days: int = 7) -> Dict:
+    """Create a new task"""
+    return DatabaseTools(_db_from_config(config)).create_task_func(
+        project_id, title, description, priority, assigned_to_id, deadline_days
+    )
+
+
+@tool
+def update_task_status(task_id: str, status: str, config: RunnableConfig) -> Dict:
+    """Update task status"""
+    return DatabaseTools(_db_from_config(config)).update_task_status_func(task_id, status)
+
+
+@tool
+def get_overdue_tasks(user_id: str, config: RunnableConfig, limit: int = 50) -> List[Dict]:
+    """Get the most overdue tasks for a user's projects"""
+    return DatabaseTools(_db_from_config(config)).get_overdue_tasks_func(user_id, limit)
+
+
+AGENT_TOOLS = [
+    get_user_projects,
+    get_project_tasks,
+    create_task,
+    update_task_status,
+    get_overdue_tasks,
+]
+TOOLS_BY_NAME = {agent_tool.name: agent_tool for agent_tool in AGENT_TOOLS}
+
+
+def _run_tool_call(tool_call: Dict, config: RunnableConfig, own_session: bool) -> ToolMessage:
+    """
+    Run one tool call in a worker thread. With own_session the call gets a
+    short-lived session from the pool, so sibling calls don't share a Session.
+    """
+    name = tool_call["name"]
+    started = time.perf_counter()
+    try:
+        if name not in TOOLS_BY_NAME:
+            raise ValueError(f"Unknown tool {name}")
+        if not own_session:
+            result = TOOLS_BY_NAME[name].invoke(tool_call["args"], config)
+        else:
+            with database.SessionLocal(bind=_db_from_config(config).get_bind()) as db:
+                call_config = {**config, "configurable": {**config["configurable"], "db": db}}
+                result = TOOLS_BY_NAME[name].invoke(tool_call["args"], call_config)
+        content = result if isinstance(result, str) else json.dumps(result, default=str)
+        metrics.TOOL_LATENCY.labels(name, "ok").observe(time.perf_counter() - started)
+        return ToolMessage(content=content, name=name, tool_call_id=tool_call["id"])
+    except Exception as e:
+        metrics.TOOL_LATENCY.labels(name, "error").observe(time.perf_counter() - started)
+        return ToolMessage(content=f"Error: {str(e)}", name=name, tool_call_id=tool_call["id"], status="error")
+
+
+async def run_tool_calls(tool_calls: List[Dict], config: RunnableConfig) -> List[ToolMessage]:
+    """Run the tool calls of one model step concurrently; results keep the call order"""
+    own_session = len(tool_calls) > 1
+    return list(await asyncio.gather(*(
+        asyncio.to_thread(_run_tool_call, tool_call, config, own_session)
+        for tool_call in tool_calls
+    )))
 
 
 class TaskAnalysisAgent:
     """Specialized agent for deep task analysis and optimization"""
     
-    def __init__(self, db: Session):
-        self.db = db
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
-            google_api_key=os.getenv("GOOGLE_API_KEY"),
-            temperature=0.2
-        )
+    def __init__(self):
+        self.llm = create_chat_model(temperature=0.2)
     
-    def analyze_task_complexity(self, task_id: str) -> Dict:
+    async def _complete(self, prompt: str, tags: List[str] = ()) -> str:
+        """Run a single-prompt completion, served from the LLM cache when possible"""
+        key = cache_key(self.llm.model, self.llm.temperature, prompt)
+        cached = await llm_cache.aget(key)
+        if cached is not None:
+            return cached
+        
+        response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+        await llm_cache.aset(key, response.content, tags)
+        return response.content
+    
+    async def analyze_task_complexity(self, task_id: str, db: Session) -> Dict:
         """Analyze task complexity and suggest breakdown"""
-        task = self.db.query(models.Task).filter(models.Task.id == task_id).first()
+        task = await asyncio.to_thread(
+            lambda: db.query(models.Task).filter(models.Task.id == task_id).first()
+        )
         if not task:
             return {"error": "Task not found"}
         
@@ -236,16 +305,17 @@ class TaskAnalysisAgent:
         Format as JSON.
         """
         
+        content = None
         try:
-            response = self.llm.invoke([HumanMessage(content=prompt)])
-            analysis = json.loads(response.content)
+            content = await self._complete(prompt, tags=[task_tag(task_id)])
+            analysis = json.loads(content)
             return analysis
         except json.JSONDecodeError:
-            return {"analysis": response.content}
+            return {"analysis": content}
         except Exception as e:
             return {"error": f"Analysis failed: {str(e)}"}
     
-    def suggest_task_breakdown(self, project_description: str, context: Dict) -> List[Dict]:
+    async def suggest_task_breakdown(self, project_description: str, context: Dict) -> List[Dict]:
         """Intelligently suggest task breakdown for a project"""
         prompt = f"""
         Based on this project description, create a comprehensive task breakdown.
@@ -276,8 +346,7 @@ class TaskAnalysisAgent:
         """
         
         try:
-            response = self.llm.invoke([HumanMessage(content=prompt)])
-            response_text = response.content.strip()
+            response_text = (await self._complete(prompt)).strip()
             
             # Remove markdown code blocks if present
             if response_text.startswith('```'):
@@ -340,41 +409,39 @@ class TaskAnalysisAgent:
 class ProjectManagerAgent:
     """Intelligent project management agent"""
     
-    def __init__(self, db: Session):
-        self.db = db
-        self.db_tools = DatabaseTools(db)
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
-            google_api_key=os.getenv("GOOGLE_API_KEY"),
-            temperature=0.1
-        )
+    def __init__(self):
+        self.llm = create_chat_model(temperature=0.1)
         
-        # Get tools as properties
-        self.tools = [
-            self.db_tools.get_user_projects,
-            self.db_tools.get_project_tasks,
-            self.db_tools.create_task,
-            self.db_tools.update_task_status,
-            self.db_tools.get_overdue_tasks
-        ]
+        # Tools, model binding and graph are shared by every request;
+        # the database session is passed in through the run config
+        self.tools = AGENT_TOOLS
         self.llm_with_tools = self.llm.bind_tools(self.tools)
         
+        # Number of most recent user turns kept in a conversation thread
+        self.history_turns = int(os.getenv("AGENT_HISTORY_TURNS", "5"))
+        
         # Create the graph
         self.graph = self._create_graph()
     
     def _create_graph(self):
         """Create the LangGraph workflow"""
         
-        def analyze_request(state: AgentState) -> AgentState:
+        def load_user_and_project(db: Session, user_id: str, project_id: Optional[str]):
+            user = db.query(models.User).filter(models.User.id == user_id).first()
+            project = None
+            if project_id:
+                project = db.query(models.Project).filter(models.Project.id == project_id).first()
+            return user, project
+        
+        async def analyze_request(state: AgentState, config: RunnableConfig) -> AgentState:
             """Analyze the user request and determine context"""
             messages = state["messages"]
             last_message = messages[-1].content if messages else ""
             
-            # Get user and project context
-            user = self.db.query(models.User).filter(models.User.id == state["user_id"]).first()
-            project = None
-            if state.get("project_id"):
-                project = self.db.query(models.Project).filter(models.Project.id == state["project_id"]).first()
+            # Get user and project context off the event loop
+            user, project = await asyncio.to_thread(
+                load_user_and_project, _db_from_config(config), state["user_id"], state.get("project_id")
+            )
             
             context = {
                 "user_name": user.username if user else "Unknown",
@@ -383,10 +450,14 @@ class ProjectManagerAgent:
                 "timestamp": datetime.now().isoformat()
             }
             
-            state["context"] = context
-            return state
+            # Cap the thread's stored history; dropped messages leave the checkpoint too
+            stale_messages = _messages_beyond_turns(messages, self.history_turns)
+            return {
+                "context": context,
+                "messages": [RemoveMessage(id=message.id) for message in stale_messages]
+            }
         
-        def execute_action(state: AgentState) -> AgentState:
+        async def execute_action(state: AgentState) -> AgentState:
             """Execute the appropriate action based on request analysis"""
             context = state["context"]
             messages = state["messages"]
@@ -412,7 +483,7 @@ class ProjectManagerAgent:
             
             # Get AI response with tool calls
             try:
-                response = self.llm_with_tools.invoke(full_messages)
+                response = await self.llm_with_tools.ainvoke(full_messages)
                 state["messages"].append(response)
                 state["action_taken"] = bool(hasattr(response, 'tool_calls') and response.tool_calls)
             except Exception as e:
@@ -423,27 +494,26 @@ class ProjectManagerAgent:
             
             return state
         
-        def process_tools(state: AgentState) -> AgentState:
+        async def process_tools(state: AgentState, config: RunnableConfig) -> AgentState:
             """Process any tool calls"""
             last_message = state["messages"][-1]
             
             if hasattr(last_message, 'tool_calls') and last_message.tool_calls:
                 try:
-                    tool_node = ToolNode(self.tools)
-                    tool_results = tool_node.invoke({"messages": [last_message]})
-                    state["messages"].extend(tool_results["messages"])
+                    # Calls from the same step run side by side, each in its own session
+                    state["messages"].extend(await run_tool_calls(last_message.tool_calls, config))
                 except Exception as e:
                     error_message = AIMessage(content=f"Tool execution failed: {str(e)}")
                     state["messages"].append(error_message)
             
             return state
         
-        def generate_final_response(state: AgentState) -> AgentState:
+        async def generate_final_response(state: AgentState) -> AgentState:
             """Generate final response with insights and recommendations"""
             if state["action_taken"]:
                 # Generate follow-up response considering tool results
                 try:
-                    response = self.llm.invoke(state["messages"] + [
+                    response = await self.llm.ainvoke(state["messages"] + [
                         SystemMessage(content="Provide a clear summary of what was accomplished and any recommendations.")
                     ])
                     state["messages"].append(response)
@@ -465,10 +535,10 @@ class ProjectManagerAgent:
         workflow = StateGraph(AgentState)
         
         # Add nodes
-        workflow.add_node("analyze", analyze_request)
-        workflow.add_node("execute", execute_action)
-        workflow.add_node("tools", process_tools)
-        workflow.add_node("finalize", generate_final_response)
+        workflow.add_node("analyze", metrics.timed_node("analyze", analyze_request))
+        workflow.add_node("execute", metrics.timed_node("execute", execute_action))
+        workflow.add_node("tools", metrics.timed_node("tools", process_tools))
+        workflow.add_node("finalize", metrics.timed_node("finalize", generate_final_response))
         
         # Add edges
         workflow.add_edge(START, "analyze")
@@ -477,15 +547,15 @@ class ProjectManagerAgent:
         workflow.add_edge("tools", "finalize")
         workflow.add_edge("finalize", END)
         
-        # Compile with memory
+        # Compile with the durable conversation store, falling back to process memory
         try:
-            memory = MemorySaver()
-            return workflow.compile(checkpointer=memory)
+            return workflow.compile(checkpointer=create_checkpointer_from_env())
         except Exception as e:
-            print(f"Warning: Could not compile workflow with memory: {e}")
-            return workflow.compile()
+            print(f"Warning: Could not compile workflow with the SQL checkpointer: {e}")
+            return workflow.compile(checkpointer=MemorySaver())
     
-    def _classify_request(self, message: str) -> str:
+    @staticmethod
+    def _classify_request(message: str) -> str:
         """Classify the type of request"""
         message_lower = message.lower()
         
@@ -504,18 +574,61 @@ class ProjectManagerAgent:
 class SmartProjectManager:
     """Main orchestrator for all AI agents"""
     
+    AGENT_TYPES = {
+        "project_manager": ProjectManagerAgent,
+        "task_analyzer": TaskAnalysisAgent,
+    }
+    
     def __init__(self):
         self.agents = {}
+        self._lock = threading.Lock()
     
-    def get_agent(self, agent_type: str, db: Session):
-        """Get or create agent instance"""
-        # Create new agent for each request to avoid database session issues
-        if agent_type == "project_manager":
-            return ProjectManagerAgent(db)
-        elif agent_type == "task_analyzer":
-            return TaskAnalysisAgent(db)
-        else:
+    def get_agent(self, agent_type: str):
+        """Get the process-wide agent instance, building it on first use"""
+        if agent_type not in self.AGENT_TYPES:
             raise ValueError(f"Unknown agent type: {agent_type}")
+        
+        agent = self.agents.get(agent_type)
+        if agent is None:
+            with self._lock:
+                agent = self.agents.get(agent_type)
+                if agent is None:
+                    agent = self.AGENT_TYPES[agent_type]()
+                    self.agents[agent_type] = agent
+        return agent
+    
+    def warmup(self):
+        """Build every agent (LLM clients, bound tools, compiled graph) up front"""
+        for agent_type in self.AGENT_TYPES:
+            self.get_agent(agent_type)
+    
+    @staticmethod
+    def _is_task_analysis(query: str) -> bool:
+        """Whether a query goes to the task analyzer rather than the project manager graph"""
+        query_lower = query.lower()
+        return any(word in query_lower for word in ["analyze", "complexity", "breakdown", "estimate"])
+    
+    @staticmethod
+    def _graph_input(user_id: str, query: str, project_id: Optional[str],
+                     task_id: Optional[str], db: Session):
+        """Initial state and run config for the project manager graph"""
+        initial_state = AgentState(
+            messages=[HumanMessage(content=query)],
+            user_id=user_id,
+            project_id=project_id,
+            task_id=task_id,
+            context={},
+            action_taken=False,
+            result={}
+        )
+        config = {"configurable": {"thread_id": f"{user_id}_{project_id or 'general'}", "db": db}}
+        return initial_state, config
+    
+    @staticmethod
+    async def _fast_answer(user_id: str, query: str, project_id: Optional[str], db: Session) -> Optional[Dict]:
+        """Deterministic answer for structured queries, or None when the LLM is needed"""
+        request_type = ProjectManagerAgent._classify_request(query)
+        return await asyncio.to_thread(fast_path.try_answer, db, user_id, query, project_id, request_type)
     
     async def process_request(self, 
                             user_id: str,
@@ -527,32 +640,24 @@ class SmartProjectManager:
         
         try:
             # Determine which agent to use
-            query_lower = query.lower()
-            
-            if any(word in query_lower for word in ["analyze", "complexity", "breakdown", "estimate"]):
+            if self._is_task_analysis(query):
+                agent = self.get_agent("task_analyzer")
                 if task_id:
-                    agent = self.get_agent("task_analyzer", db)
-                    return agent.analyze_task_complexity(task_id)
+                    return await agent.analyze_task_complexity(task_id, db)
                 else:
-                    agent = self.get_agent("task_analyzer", db)
-                    return {"suggested_tasks": agent.suggest_task_breakdown(query, {"user_id": user_id})}
+                    return {"suggested_tasks": await agent.suggest_task_breakdown(query, {"user_id": user_id})}
             
-            # Use project manager agent for most requests
-            agent = self.get_agent("project_manager", db)
+            # Structured questions are answered from SQL without the LLM
+            answer = await self._fast_answer(user_id, query, project_id, db)
+            if answer is not None:
+                return answer
             
-            initial_state = AgentState(
-                messages=[HumanMessage(content=query)],
-                user_id=user_id,
-                project_id=project_id,
-                task_id=task_id,
-                context={},
-                action_taken=False,
-                result={}
-            )
+            # Use project manager agent for most requests
+            agent = self.get_agent("project_manager")
+            initial_state, config = self._graph_input(user_id, query, project_id, task_id, db)
             
             # Run the agent workflow
-            config = {"configurable": {"thread_id": f"{user_id}_{project_id or 'general'}"}}
-            final_state = agent.graph.invoke(initial_state, config)
+            final_state = await agent.graph.ainvoke(initial_state, config)
             
             return final_state["result"]
             
@@ -563,6 +668,63 @@ class SmartProjectManager:
                 "details": str(e),
                 "response": "I encountered an error while processing your request. Please try again or rephrase your question."
             }
+    
+    async def stream_request(self,
+                             user_id: str,
+                             query: str,
+                             project_id: Optional[str] = None,
+                             task_id: Optional[str] = None,
+                             db: Session = None) -> AsyncIterator[Dict]:
+        """
+        Process a request like process_request, yielding events as they happen:
+        node start/end, tool start/end, answer tokens, then the final result.
+        """
+        try:
+            if self._is_task_analysis(query):
+                # Single LLM call with a structured result; nothing to stream
+                yield {"event": "result", "data": await self.process_request(user_id, query, project_id, task_id, db)}
+                return
+            
+            answer = await self._fast_answer(user_id, query, project_id, db)
+            if answer is not None:
+                yield {"event": "result", "data": answer}
+                return
+            
+            agent = self.get_agent("project_manager")
+            initial_state, config = self._graph_input(user_id, query, project_id, task_id, db)
+            
+            result = None
+            async for event in agent.graph.astream_events(initial_state, config, version="v2"):
+                kind = event["event"]
+                name = event["name"]
+                node = event.get("metadata", {}).get("langgraph_node")
+                
+                if kind in ("on_chain_start", "on_chain_end") and name in GRAPH_NODES and name == node:
+                    status = "started" if kind == "on_chain_start" else "finished"
+                    yield {"event": "node", "data": {"node": name, "status": status}}
+                elif kind == "on_tool_start":
+                    yield {"event": "tool", "data": {"tool": name, "status": "started", "input": event["data"].get("input")}}
+                elif kind == "on_tool_end":
+                    yield {"event": "tool", "data": {"tool": name, "status": "finished"}}
+                elif kind == "on_chat_model_stream" and node in ("execute", "finalize"):
+                    content = event["data"]["chunk"].content
+                    if isinstance(content, str) and content:
+                        yield {"event": "token", "data": {"node": node, "text": content}}
+                elif kind == "on_chain_end" and not event.get("parent_ids"):
+                    result = event["data"]["output"]["result"]
+            
+            yield {"event": "result", "data": result}
+        
+        except Exception as e:
+            print(f"Error in stream_request: {str(e)}")
+            yield {
+                "event": "error",
+                "data": {
+                    "error": "Failed to process request",
+                    "details": str(e),
+                    "response": "I encountered an error while processing your request. Please try again or rephrase your question."
+                }
+            }
 
 
 # Global instance
@@ -570,6 +732,50 @@ smart_pm = SmartProjectManager()
 
 
 # FastAPI endpoint functions (to replace your existing ones)
+# Shared computations for the project-level AI endpoints
+single_flight = SingleFlight()
+
+
+def _project_data_version(db: Session, project_id: Optional[str]) -> int:
+    """project_stats.version changes with every task write, so it identifies the data an answer was based on"""
+    if not project_id:
+        return 0
+    version = db.scalar(
+        select(models.ProjectStats.version).filter(models.ProjectStats.project_id == project_id)
+    ) or 0
+    # End the read transaction so the request's connection isn't held idle during the LLM call
+    db.commit()
+    return version
+
+
+async def _coalesced(endpoint: str, user_id: str, project_id: Optional[str], query: str, db: Session,
+                     compute: Callable[[Session], Awaitable[Dict]]) -> Dict:
+    """
+    Run `compute` once for all concurrent identical requests, keyed on
+    (endpoint, user_id, project_id, normalized query, data version). The
+    shared run opens its own session so it does not depend on whichever
+    request started it staying connected.
+
+    user_id stays in the key for every endpoint that goes through here. All
+    of them run the project manager graph, whose answer depends on the
+    caller: the conversation is checkpointed into the user's own thread, the
+    prompt names the user, and get_overdue_tasks / get_user_projects read
+    every project the user owns, not just `project_id`. Sharing one run
+    between team members could show a collaborator the owner's other
+    projects, so only one user's duplicates (retries, double clicks, several
+    tabs) are collapsed. Cross-user sharing would need a project-only run
+    without user-scoped tools or history.
+    """
+    version = await asyncio.to_thread(_project_data_version, db, project_id)
+    key = (endpoint, user_id, project_id, " ".join(query.lower().split()), version)
+    
+    async def run():
+        with database.session_scope() as shared_db:
+            return await compute(shared_db)
+    
+    return await single_flight.do(key, run)
+
+
 async def ai_smart_assistant(user_id: str, query: str, project_id: str = None, 
                            task_id: str = None, db: Session = None):
     """Main AI assistant endpoint"""
@@ -579,13 +785,116 @@ async def ai_smart_assistant(user_id: str, query: str, project_id: str = None,
 async def ai_project_insights(user_id: str, project_id: str, db: Session):
     """Get comprehensive project insights"""
     query = f"Provide a comprehensive analysis of project status, identify bottlenecks, overdue tasks, and strategic recommendations for project {project_id}"
-    return await smart_pm.process_request(user_id, query, project_id, None, db)
+    return await _coalesced(
+        "project_insights", user_id, project_id, query, db,
+        lambda shared_db: smart_pm.process_request(user_id, query, project_id, None, shared_db)
+    )
+
+
+# Queries behind /ai/workflow_automation, keyed by automation_type
+AUTOMATION_QUERIES = {
+    "daily_standup": "Provide a daily standup summary: what was completed yesterday, what's planned for today, and any blockers",
+    "weekly_review": "Generate a weekly project review with accomplishments, challenges, and next week's priorities",
+    "deadline_alert": "Analyze upcoming deadlines and identify any risks or items that need attention"
+}
+
+TEAM_INSIGHTS_QUERY = "Analyze team performance, workload distribution, and provide recommendations for better collaboration and task assignment"
+
+
+async def ai_run_workflow_automation(user_id: str, project_id: str, automation_type: str, db: Session):
+    """Run one of the workflow automations (daily standup, weekly review, deadline alert)"""
+    if automation_type == "deadline_alert" and fast_path.ENABLED:
+        # Fully answerable from deadlines in the database
+        result = await asyncio.to_thread(fast_path.answer_deadline_alert, db, user_id, project_id)
+        if result is not None:
+            return {"automation": result, "type": automation_type}
+    
+    query = AUTOMATION_QUERIES.get(automation_type, "Provide general project automation insights")
+    result = await _coalesced(
+        "workflow_automation", user_id, project_id, query, db,
+        lambda shared_db: smart_pm.process_request(user_id, query, project_id, None, shared_db)
+    )
+    return {"automation": result, "type": automation_type}
+
+
+async def ai_analyze_team(user_id: str, project_id: Optional[str], db: Session):
+    """Team performance and workload analysis"""
+    if not project_id:
+        # Spans all of the user's projects, so there is nothing to share
+        return await smart_pm.process_request(user_id, TEAM_INSIGHTS_QUERY, None, None, db)
+    return await _coalesced(
+        "team_insights", user_id, project_id, TEAM_INSIGHTS_QUERY, db,
+        lambda shared_db: smart_pm.process_request(user_id, TEAM_INSIGHTS_QUERY, project_id, None, shared_db)
+    )
 
 
 async def ai_task_optimizer(task_id: str, db: Session):
     """Optimize and analyze specific task"""
-    agent = smart_pm.get_agent("task_analyzer", db)
-    return agent.analyze_task_complexity(task_id)
+    agent = smart_pm.get_agent("task_analyzer")
+    return await agent.analyze_task_complexity(task_id, db)
+
+
+# Deadline for suggested tasks when the model's estimate is missing or unusable
+DEFAULT_SUGGESTED_DAYS = 7
+MAX_SUGGESTED_DAYS = 365
+
+
+def _suggested_deadline_days(value) -> int:
+    """The model's estimated_days as a whole number of days in 1..MAX_SUGGESTED_DAYS."""
+    try:
+        days = float(value)
+    except (TypeError, ValueError):
+        return DEFAULT_SUGGESTED_DAYS
+    if days != days: # NaN
+        return DEFAULT_SUGGESTED_DAYS
+    return int(min(max(days, 1), MAX_SUGGESTED_DAYS))
+
+
+def _create_suggested_tasks(db: Session, project_id: str, suggested_tasks: List[Dict]):
+    """
+    Insert AI-suggested tasks with one batched INSERT and a single commit
+    (blocking; run off the event loop). Either all tasks are created or none.
+    """
+    now = datetime.now()
+    try:
+        # Built inside the try: the suggestions are model output and may be malformed
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "project_id": project_id,
+                "title": task_data.get("title", "Untitled Task"),
+                "description": task_data.get("description", ""),
+                "priority": task_data.get("priority", "medium"),
+                "assigned_to_id": None,
+                "created_at": now,
+                "deadline": now + timedelta(days=_suggested_deadline_days(task_data.get("estimated_days"))),
+                "status": "todo"
+            }
+            for task_data in suggested_tasks
+        ]
+        new_tasks = db.scalars(queries.insert_tasks(), rows).all()
+        project_stats.record_bulk_insert(db.connection(), rows)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        creation_errors = [
+            {"task": task_data.get("title", "Unknown") if isinstance(task_data, dict) else "Unknown", "error": str(e)}
+            for task_data in suggested_tasks
+        ]
+        return [], creation_errors
+    
+    created_tasks = [
+        {
+            "id": new_task.id,
+            "title": new_task.title,
+            "description": new_task.description,
+            "priority": new_task.priority,
+            "status": "created_successfully",
+            "deadline": new_task.deadline.isoformat()
+        }
+        for new_task in new_tasks
+    ]
+    return created_tasks, []
 
 
 async def ai_smart_task_creation(user_id: str, project_id: str, description: str, 
@@ -593,8 +902,8 @@ async def ai_smart_task_creation(user_id: str, project_id: str, description: str
     """Intelligently create tasks with AI suggestions"""
     try:
         # Get task suggestions from AI
-        agent = smart_pm.get_agent("task_analyzer", db)
-        suggested_tasks = agent.suggest_task_breakdown(description, {
+        agent = smart_pm.get_agent("task_analyzer")
+        suggested_tasks = await agent.suggest_task_breakdown(description, {
             "user_id": user_id,
             "project_id": project_id
         })
@@ -605,58 +914,11 @@ async def ai_smart_task_creation(user_id: str, project_id: str, description: str
                 "message": "Please try with a more detailed description"
             }
         
-        created_tasks = []
-        creation_errors = []
-        
         # Auto-create tasks if requested
         if auto_create:
-            db_tools = DatabaseTools(db)
-            
-            for task_data in suggested_tasks:
-                try:
-                    # Ensure we have required fields
-                    title = task_data.get("title", "Untitled Task")
-                    description_text = task_data.get("description", "")
-                    priority = task_data.get("priority", "medium")
-                    deadline_days = task_data.get("estimated_days", 7)
-                    
-                    # Create task directly using database operations
-                    task_id = str(uuid.uuid4())
-                    deadline = datetime.now() + timedelta(days=deadline_days)
-                    
-                    new_task = models.Task(
-                        id=task_id,
-                        project_id=project_id,
-                        title=title,
-                        description=description_text,
-                        priority=priority,
-                        assigned_to_id=None,
-                        created_at=datetime.now(),
-                        deadline=deadline,
-                        status="todo"
-                    )
-                    
-                    db.add(new_task)
-                    db.commit()
-                    db.refresh(new_task)
-                    
-                    created_task = {
-                        "id": new_task.id,
-                        "title": new_task.title,
-                        "description": new_task.description,
-                        "priority": new_task.priority,
-                        "status": "created_successfully",
-                        "deadline": deadline.isoformat()
-                    }
-                    
-                    created_tasks.append(created_task)
-                        
-                except Exception as e:
-                    db.rollback()
-                    creation_errors.append({
-                        "task": task_data.get("title", "Unknown"),
-                        "error": str(e)
-                    })
+            created_tasks, creation_errors = await asyncio.to_thread(
+                _create_suggested_tasks, db, project_id, suggested_tasks
+            )
             
             return {
                 "message": f"Successfully created {len(created_tasks)} tasks" + 
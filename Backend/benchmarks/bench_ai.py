@@ -0,0 +1,73 @@
+# benchmarks/bench_ai.py
+"""
+The /ai/* pipelines end to end against the fake chat model
+(BENCH_LLM_LATENCY_MS per model call, default 50).
+"""
+import pytest
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from app import app
+from benchmarks import fake_llm
+
+
+@pytest.fixture(scope="module")
+def client(sample):
+    # The first model step asks for both read tools, like a typical overview question
+    fake_llm.script.tool_calls = [
+        {"name": "get_project_tasks", "args": {"project_id": sample["project_id"]}},
+        {"name": "get_overdue_tasks", "args": {"user_id": sample["user_id"]}},
+    ]
+    with TestClient(app) as client:
+        yield client
+    fake_llm.script.tool_calls = []
+
+
+def _ok(response):
+    assert response.status_code < 400, response.text
+    return response
+
+
+AI_CASES = {
+    "smart_assistant": ("/ai/smart_assistant", lambda s: {
+        "user_id": s["user_id"], "project_id": s["project_id"],
+        "query": "What should the team focus on this week?"}),
+    "smart_assistant_fast_path": ("/ai/smart_assistant", lambda s: {
+        "user_id": s["user_id"], "project_id": s["project_id"], "query": "Show overdue tasks"}),
+    "smart_assistant_stream": ("/ai/smart_assistant/stream", lambda s: {
+        "user_id": s["user_id"], "project_id": s["project_id"],
+        "query": "What should the team focus on this week?"}),
+    "project_insights": ("/ai/project_insights", lambda s: {
+        "user_id": s["user_id"], "project_id": s["project_id"]}),
+    # A single un-embedded Body(...) parameter: the JSON body is the bare task id
+    "optimize_task": ("/ai/optimize_task", lambda s: s["task_id"]),
+    "smart_task_creation": ("/ai/smart_task_creation", lambda s: {
+        "user_id": s["user_id"], "project_id": s["project_id"],
+        "description": "Add CSV export to the reports page"}),
+    "workflow_daily_standup": ("/ai/workflow_automation", lambda s: {
+        "user_id": s["user_id"], "project_id": s["project_id"], "automation_type": "daily_standup"}),
+    "workflow_deadline_alert": ("/ai/workflow_automation", lambda s: {
+        "user_id": s["user_id"], "project_id": s["project_id"], "automation_type": "deadline_alert"}),
+    "team_insights": ("/ai/team_insights", lambda s: {
+        "user_id": s["user_id"], "project_id": s["project_id"]}),
+    "submit_job": ("/ai/jobs", lambda s: {
+        "kind": "project_insights", "user_id": s["user_id"], "project_id": s["project_id"]}),
+}
+
+
+def bench_ai_route_coverage():
+    routes = {route.path for route in app.routes if isinstance(route, APIRoute) and route.path.startswith("/ai/")}
+    covered = {path for path, _ in AI_CASES.values()} | {"/ai/jobs/{job_id}"}
+    assert routes <= covered, f"AI routes without a benchmark: {sorted(routes - covered)}"
+
+
+@pytest.mark.parametrize("case", list(AI_CASES))
+def bench_ai(measure, client, sample, case):
+    path, payload = AI_CASES[case]
+    # Fewer rounds: every call pays at least one model latency
+    measure(lambda: _ok(client.post(path, json=payload(sample))), setup=lambda: ((), {}), rounds=10)
+
+
+def bench_get_job(measure, client, sample):
+    job = _ok(client.post("/ai/jobs", json=AI_CASES["submit_job"][1](sample))).json()
+    measure(lambda: _ok(client.get(f"/ai/jobs/{job['id']}")))
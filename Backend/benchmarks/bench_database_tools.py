@@ -0,0 +1,52 @@
+# benchmarks/bench_database_tools.py
+"""Every DatabaseTools function, plus one tool step with two calls running concurrently."""
+import asyncio
+import itertools
+
+import pytest
+
+import agents
+import database
+
+
+@pytest.fixture
+def tools():
+    with database.session_scope() as db:
+        yield agents.DatabaseTools(db)
+
+
+def bench_get_user_projects(measure, tools, sample):
+    measure(lambda: tools.get_user_projects_func(sample["user_id"]))
+
+
+def bench_get_project_tasks(measure, tools, sample):
+    measure(lambda: tools.get_project_tasks_func(sample["project_id"]))
+
+
+def bench_get_project_tasks_by_status(measure, tools, sample):
+    measure(lambda: tools.get_project_tasks_func(sample["project_id"], "todo"))
+
+
+def bench_create_task(measure, tools, sample):
+    counter = itertools.count()
+    measure(lambda: tools.create_task_func(sample["project_id"], f"Benchmark task {next(counter)}"))
+
+
+def bench_update_task_status(measure, tools, sample):
+    statuses = itertools.cycle(["in_progress", "todo"])
+    measure(lambda: tools.update_task_status_func(sample["task_id"], next(statuses)))
+
+
+def bench_get_overdue_tasks(measure, tools, sample):
+    measure(lambda: tools.get_overdue_tasks_func(sample["user_id"]))
+
+
+def bench_parallel_tool_step(measure, sample):
+    """get_project_tasks and get_overdue_tasks from one model step; should cost max(), not sum()."""
+    tool_calls = [
+        {"name": "get_project_tasks", "args": {"project_id": sample["project_id"]}, "id": "call_0"},
+        {"name": "get_overdue_tasks", "args": {"user_id": sample["user_id"]}, "id": "call_1"},
+    ]
+    with database.session_scope() as db:
+        config = {"configurable": {"db": db}}
+        measure(lambda: asyncio.run(agents.run_tool_calls(tool_calls, config)))
@@ -0,0 +1,94 @@
+# benchmarks/bench_routes.py
+"""Every CRUD route in app.py through the ASGI app; the /ai/* routes are in bench_ai.py."""
+import itertools
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from app import app
+
+counter = itertools.count()
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def _ok(response):
+    # /ready answers 503 until the background AI warmup is done
+    assert response.status_code < 400 or response.request.url.path == "/ready", response.text
+    return response
+
+
+def _new_task(client, sample):
+    return _ok(client.post("/tasks", json={
+        "project_id": sample["project_id"],
+        "title": f"Benchmark task {next(counter)}",
+        "deadline": (datetime.now() + timedelta(days=7)).isoformat(),
+        "status": "todo",
+    })).json()
+
+
+# (method, route path, request builder); the builder gets the client and the sample ids
+# and returns the concrete path plus request keyword arguments
+ROUTE_CASES = {
+    ("POST", "/users"): lambda client, s: ("/users", {"json": {
+        "username": f"bench_{uuid.uuid4().hex}", "clerkId": f"clerk_{uuid.uuid4().hex}"}}),
+    ("GET", "/users"): lambda client, s: ("/users", {"params": {"limit": 50}}),
+    ("GET", "/users/summary"): lambda client, s: ("/users/summary", {"params": {"limit": 50}}),
+    ("GET", "/users/by-clerk/{clerkId}"): lambda client, s: (f"/users/by-clerk/{s['clerk_id']}", {}),
+    ("GET", "/users/{user_id}"): lambda client, s: (f"/users/{s['user_id']}", {}),
+    ("POST", "/projects"): lambda client, s: ("/projects", {"json": {
+        "name": f"Benchmark project {next(counter)}", "owner_id": s["user_id"], "collaborators": []}}),
+    ("GET", "/projects"): lambda client, s: ("/projects", {"params": {"limit": 50}}),
+    ("GET", "/projects/{project_id}"): lambda client, s: (f"/projects/{s['project_id']}", {}),
+    ("GET", "/projects/{project_id}/stats"): lambda client, s: (f"/projects/{s['project_id']}/stats", {}),
+    ("POST", "/projects/add-collaborators"): lambda client, s: ("/projects/add-collaborators", {"json": {
+        "project_id": s["project_id"], "collaborator_ids": [s["user_id"]]}}),
+    ("POST", "/tasks"): lambda client, s: ("/tasks", {"json": {
+        "project_id": s["project_id"], "title": f"Benchmark task {next(counter)}",
+        "deadline": (datetime.now() + timedelta(days=7)).isoformat(), "status": "todo"}}),
+    ("POST", "/tasks/bulk"): lambda client, s: ("/tasks/bulk", {"json": {
+        "project_id": s["project_id"],
+        "tasks": [{"title": f"Bulk task {next(counter)}",
+                   "deadline": (datetime.now() + timedelta(days=7)).isoformat()} for _ in range(50)]}}),
+    ("GET", "/tasks"): lambda client, s: ("/tasks", {"params": {"project_id": s["project_id"], "limit": 100}}),
+    ("GET", "/tasks/overdue"): lambda client, s: ("/tasks/overdue", {"params": {"user_id": s["user_id"]}}),
+    ("GET", "/tasks/{task_id}"): lambda client, s: (f"/tasks/{s['task_id']}", {}),
+    ("PUT", "/tasks/{task_id}"): lambda client, s: (f"/tasks/{s['task_id']}", {"json": {
+        "status": ["todo", "in_progress"][next(counter) % 2]}}),
+    ("DELETE", "/tasks/{task_id}"): lambda client, s: (f"/tasks/{_new_task(client, s)['id']}", {}),
+    ("POST", "/comments"): lambda client, s: ("/comments", {"json": {
+        "task_id": s["task_id"], "user_id": s["user_id"], "content": "Benchmark comment"}}),
+    ("GET", "/comments"): lambda client, s: ("/comments", {"params": {"task_id": s["task_id"]}}),
+    ("GET", "/metrics"): lambda client, s: ("/metrics", {}),
+    ("GET", "/ready"): lambda client, s: ("/ready", {}),
+    ("GET", "/db/pool"): lambda client, s: ("/db/pool", {}),
+    ("GET", "/"): lambda client, s: ("/", {}),
+}
+
+
+def bench_route_coverage():
+    """New routes need a case here (or in bench_ai.py) to be benchmarked."""
+    routes = {
+        (method, route.path)
+        for route in app.routes if isinstance(route, APIRoute)
+        for method in route.methods
+        if not route.path.startswith("/ai/")
+    }
+    assert routes <= set(ROUTE_CASES), f"Routes without a benchmark: {sorted(routes - set(ROUTE_CASES))}"
+
+
+@pytest.mark.parametrize("method,route", list(ROUTE_CASES), ids=lambda value: str(value))
+def bench_route(measure, client, sample, method, route):
+    def setup():
+        # Request building (including any fixture rows it creates) stays out of the timing
+        path, kwargs = ROUTE_CASES[(method, route)](client, sample)
+        return (path,), kwargs
+
+    measure(lambda path, **kwargs: _ok(client.request(method, path, **kwargs)), setup=setup)
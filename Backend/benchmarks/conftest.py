@@ -0,0 +1,74 @@
+# benchmarks/conftest.py
+"""
+Benchmark setup: a throwaway database (BENCH_DATABASE_URL, default SQLite next to
+this file), the fake chat model in place of Gemini, and the LLM cache disabled
+so every /ai/* call pays the configured model latency.
+"""
+import os
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Must be set before database.py and llm_cache.py are imported
+os.environ["DATABASE_URL"] = os.getenv("BENCH_DATABASE_URL", f"sqlite:///{os.path.join(BENCH_DIR, 'bench.db')}")
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.pop("CHECKPOINT_DATABASE_URL", None)
+os.environ["LLM_CACHE_BACKEND"] = "none"
+os.environ.setdefault("LLM_MODE", "live") # "replay" benchmarks a recorded cassette instead of the fake model
+os.environ["JOB_BACKEND"] = "memory"
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+import pytest
+from sqlalchemy import select
+
+import app  # noqa: F401 - instruments the engines for query counting
+import database
+import llm_provider
+import models
+from benchmarks import fake_llm, seed
+from benchmarks.reporting import Recorder
+
+llm_provider.ChatGoogleGenerativeAI = fake_llm.FakeChatModel
+
+recorder = Recorder()
+
+# Scale used when the benchmark database is empty; seed larger data sets with
+# `python -m benchmarks.seed` and point BENCH_DATABASE_URL at them.
+DEFAULT_SCALE = {"users": 50, "projects": 200, "tasks": 10000, "comments": 5000}
+
+
+@pytest.fixture(scope="session")
+def sample():
+    """Ids of existing rows to benchmark against, seeding the database first if needed."""
+    database.Base.metadata.create_all(bind=database.engine)
+    with database.session_scope() as db:
+        if db.scalar(select(models.Task.id).limit(1)) is None:
+            seed.seed(database.engine, **DEFAULT_SCALE, create_schema=False)
+
+        # The owner of the busiest project, so the per-user queries have work to do
+        project = db.scalars(
+            select(models.Project)
+            .join(models.ProjectStats, models.ProjectStats.project_id == models.Project.id)
+            .order_by(models.ProjectStats.total_count.desc())
+            .limit(1)
+        ).one()
+        owner = db.get(models.User, project.owner_id)
+        task = db.scalars(select(models.Task).where(models.Task.project_id == project.id).limit(1)).one()
+        return {
+            "user_id": owner.id,
+            "clerk_id": owner.clerkId,
+            "project_id": project.id,
+            "task_id": task.id,
+        }
+
+
+@pytest.fixture
+def measure(benchmark):
+    """measure(fn, setup=None, rounds=30): benchmark fn and record p50/p95/p99 and queries per call."""
+    def run(fn, setup=None, rounds=30):
+        return recorder.measure(benchmark, fn, setup, rounds)
+    return run
+
+
+def pytest_terminal_summary(terminalreporter):
+    terminalreporter.section("latency percentiles and queries per request")
+    recorder.report(terminalreporter.write_line)
@@ -0,0 +1,86 @@
+# benchmarks/fake_llm.py
+"""
+In-process stand-in for ChatGoogleGenerativeAI, so the /ai/* pipelines can be
+benchmarked offline. Every call sleeps for a configurable latency and returns
+a canned answer in the shape the agents expect.
+"""
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+class FakeScript:
+    """What the fake model does; benchmarks adjust it between runs."""
+
+    def __init__(self):
+        self.latency = float(os.getenv("BENCH_LLM_LATENCY_MS", "50")) / 1000
+        # Tool calls issued on the first model step, e.g.
+        # [{"name": "get_project_tasks", "args": {"project_id": "..."}}]
+        self.tool_calls: List[Dict] = []
+        self.calls = 0
+
+
+script = FakeScript()
+
+ANALYSIS = {
+    "complexity": 5,
+    "subtasks": [],
+    "time_estimate": "3 days",
+    "risk_factors": ["scope creep"],
+    "dependencies": [],
+    "optimization_suggestions": ["split review into its own task"],
+}
+
+BREAKDOWN = [
+    {"title": f"Benchmark task {i}", "description": "Generated by the fake model", "priority": priority,
+     "estimated_days": i + 2, "dependencies": [], "skills_required": ["python"]}
+    for i, priority in enumerate(("high", "medium", "low", "medium"))
+]
+
+
+class FakeChatModel(BaseChatModel):
+    """Accepts the ChatGoogleGenerativeAI constructor arguments used by llm_provider.py."""
+
+    model: str = "fake-chat"
+    temperature: float = 0.0
+    google_api_key: Optional[str] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tool_names=[tool.name for tool in tools], **kwargs)
+
+    def _respond(self, messages: List[BaseMessage], tool_names: Optional[List[str]]) -> AIMessage:
+        script.calls += 1
+        if tool_names and isinstance(messages[-1], HumanMessage):
+            calls = [
+                {"name": call["name"], "args": call["args"], "id": f"call_{script.calls}_{i}"}
+                for i, call in enumerate(script.tool_calls) if call["name"] in tool_names
+            ]
+            if calls:
+                return AIMessage(content="", tool_calls=calls)
+
+        prompt = messages[-1].content if messages else ""
+        if "JSON array" in prompt:
+            return AIMessage(content=json.dumps(BREAKDOWN))
+        if "Format as JSON" in prompt:
+            return AIMessage(content=json.dumps(ANALYSIS))
+        return AIMessage(content="Summary: the project is on track. Recommendation: review overdue tasks weekly.")
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, tool_names: Optional[List[str]] = None, **kwargs) -> ChatResult:
+        time.sleep(script.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages, tool_names))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, tool_names: Optional[List[str]] = None, **kwargs) -> ChatResult:
+        await asyncio.sleep(script.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages, tool_names))])
@@ -0,0 +1,53 @@
+# benchmarks/reporting.py
+"""
+Latency percentiles and queries-per-request for the benchmark runs.
+"""
+import statistics
+from typing import Callable, Dict, List, Optional
+
+import query_counter
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 of per-call timings (seconds) in milliseconds."""
+    if len(samples) < 2:
+        value = samples[0] * 1000 if samples else 0.0
+        return {"p50_ms": value, "p95_ms": value, "p99_ms": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50_ms": cuts[49] * 1000, "p95_ms": cuts[94] * 1000, "p99_ms": cuts[98] * 1000}
+
+
+class Recorder:
+    """Runs one benchmark case and keeps its summary for the end-of-run report."""
+
+    def __init__(self):
+        self.results: List[Dict] = []
+
+    def measure(self, benchmark, fn: Callable, setup: Optional[Callable] = None, rounds: int = 30):
+        # One untimed call counts the queries and warms caches and pools. Routes
+        # track their own requests; those tallies add up into this one.
+        args = setup() if setup else ((), {})
+        with query_counter.track() as stats:
+            fn(*args[0], **args[1])
+        queries = stats.count
+
+        if setup:
+            result = benchmark.pedantic(fn, setup=setup, rounds=rounds)
+        else:
+            result = benchmark(fn)
+
+        summary = {**percentiles(benchmark.stats.stats.data), "queries": queries}
+        benchmark.extra_info.update(summary)
+        self.results.append({"name": benchmark.name, **summary})
+        return result
+
+    def report(self, write_line: Callable[[str], None]):
+        if not self.results:
+            return
+        width = max(len(result["name"]) for result in self.results)
+        write_line(f"{'benchmark'.ljust(width)}  {'p50 ms':>9}  {'p95 ms':>9}  {'p99 ms':>9}  {'queries':>7}")
+        for result in sorted(self.results, key=lambda result: result["name"]):
+            write_line(
+                f"{result['name'].ljust(width)}  {result['p50_ms']:9.2f}  {result['p95_ms']:9.2f}  "
+                f"{result['p99_ms']:9.2f}  {result['queries']:7d}"
+            )
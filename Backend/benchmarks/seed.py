@@ -0,0 +1,158 @@
+# benchmarks/seed.py
+"""
+Fill a database with synthetic users, projects, tasks and comments for benchmarking.
+
+Usage (from the Backend directory):
+    python -m benchmarks.seed --database-url sqlite:///bench.db
+    python -m benchmarks.seed --database-url postgresql://localhost/planora_bench \\
+        --users 2000 --projects 10000 --tasks 1000000 --comments 500000
+"""
+import argparse
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+from sqlalchemy import create_engine, insert
+
+import database
+import models
+import project_stats
+
+STATUSES = ("todo", "in_progress", "done")
+STATUS_WEIGHTS = (0.45, 0.25, 0.30)
+PRIORITIES = ("high", "medium", "low")
+WORDS = (
+    "api", "auth", "billing", "dashboard", "deploy", "docs", "export", "import", "login",
+    "migration", "mobile", "notifications", "onboarding", "payments", "reports", "search",
+    "settings", "sync", "tests", "uploads",
+)
+VERBS = ("Build", "Fix", "Refactor", "Review", "Design", "Document", "Test", "Ship")
+
+BATCH_SIZE = 5000
+
+
+class Generator:
+    """Deterministic row generator; the same seed and scale always produce the same data."""
+
+    def __init__(self, seed: int, now: datetime):
+        self.rng = random.Random(seed)
+        self.now = now
+
+    def id(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def sentence(self, words: int) -> str:
+        return " ".join(self.rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+    def users(self, count: int) -> List[Dict]:
+        return [
+            {"id": self.id(), "username": f"user{i:07d}", "clerkId": f"clerk_{i:07d}"}
+            for i in range(count)
+        ]
+
+    def projects(self, count: int, user_ids: List[str]) -> List[Dict]:
+        rows = []
+        for i in range(count):
+            rows.append({
+                "id": self.id(),
+                "name": f"{self.rng.choice(WORDS).capitalize()} project {i}",
+                "description": self.sentence(12),
+                "owner_id": self.rng.choice(user_ids),
+                "collaborators": self.rng.sample(user_ids, min(len(user_ids), self.rng.randint(0, 4))),
+            })
+        return rows
+
+    def tasks(self, count: int, project_ids: List[str], user_ids: List[str]) -> Iterator[Dict]:
+        for _ in range(count):
+            created_at = self.now - timedelta(days=self.rng.uniform(0, 120))
+            status = self.rng.choices(STATUSES, STATUS_WEIGHTS)[0]
+            yield {
+                "id": self.id(),
+                "project_id": self.rng.choice(project_ids),
+                "title": f"{self.rng.choice(VERBS)} {self.rng.choice(WORDS)} {self.rng.choice(WORDS)}",
+                "description": self.sentence(self.rng.randint(5, 40)),
+                "created_at": created_at,
+                # Roughly a fifth of the open tasks end up overdue
+                "deadline": self.now + timedelta(days=self.rng.uniform(-30, 90)),
+                "priority": self.rng.choice(PRIORITIES),
+                "assigned_to_id": self.rng.choice(user_ids) if self.rng.random() < 0.8 else None,
+                "status": status,
+                "updated_at": created_at + timedelta(days=self.rng.uniform(0, 10)),
+            }
+
+    def comments(self, count: int, task_ids: List[str], user_ids: List[str]) -> Iterator[Dict]:
+        for _ in range(count):
+            yield {
+                "id": self.id(),
+                "task_id": self.rng.choice(task_ids),
+                "user_id": self.rng.choice(user_ids),
+                "content": self.sentence(self.rng.randint(3, 25)),
+            }
+
+
+def _batches(rows, size: int = BATCH_SIZE) -> Iterator[List[Dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def seed(engine, users: int, projects: int, tasks: int, comments: int,
+         seed_value: int = 42, create_schema: bool = True) -> Dict[str, int]:
+    """Insert the synthetic data set and rebuild project_stats. Returns row counts."""
+    if create_schema:
+        database.Base.metadata.create_all(bind=engine)
+    generator = Generator(seed_value, datetime.now())
+
+    user_rows = generator.users(users)
+    user_ids = [row["id"] for row in user_rows]
+    project_rows = generator.projects(projects, user_ids)
+    project_ids = [row["id"] for row in project_rows]
+    task_ids: List[str] = []
+
+    with engine.begin() as conn:
+        conn.execute(insert(models.User.__table__), user_rows)
+        for batch in _batches(project_rows):
+            conn.execute(insert(models.Project.__table__), batch)
+        # Core inserts skip the ORM events, so the counters are rebuilt at the end
+        for batch in _batches(generator.tasks(tasks, project_ids, user_ids)):
+            conn.execute(insert(models.Task.__table__), batch)
+            task_ids.extend(row["id"] for row in batch)
+        if task_ids:
+            for batch in _batches(generator.comments(comments, task_ids, user_ids)):
+                conn.execute(insert(models.Comment.__table__), batch)
+        project_stats.rebuild(conn)
+
+    return {"users": users, "projects": projects, "tasks": tasks, "comments": comments if task_ids else 0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=database.DATABASE_URL,
+                        help="target database (defaults to DATABASE_URL; use a throwaway database)")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--projects", type=int, default=1000)
+    parser.add_argument("--tasks", type=int, default=50000)
+    parser.add_argument("--comments", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--no-create-schema", action="store_true",
+                        help="skip create_all (the schema already comes from the Alembic migrations)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    counts = seed(
+        create_engine(args.database_url), args.users, args.projects, args.tasks, args.comments,
+        args.seed, not args.no_create_schema,
+    )
+    print(", ".join(f"{count} {name}" for name, count in counts.items()),
+          f"inserted in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+# checkpointer.py
+# Durable, bounded LangGraph checkpointer backed by SQL tables.
+#
+# Conversations are stored in agent_checkpoints / agent_checkpoint_writes so a
+# thread ({user_id}_{project_id}) continues across requests and workers. Storage
+# stays bounded: each thread keeps only its latest `max_checkpoints` checkpoints
+# (older ones and their writes are compacted away on every put), and threads
+# idle for longer than `ttl` seconds are evicted periodically.
+import asyncio
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from sqlalchemy import create_engine, delete, select
+from sqlalchemy.orm import Session
+
+import database
+import models
+
+CHECKPOINT_TABLES = [models.AgentCheckpoint.__table__, models.AgentCheckpointWrite.__table__]
+
+
+class SQLCheckpointSaver(BaseCheckpointSaver):
+    def __init__(self, engine, max_checkpoints: int = 10, ttl: int = 7 * 24 * 3600,
+                 evict_every: int = 100):
+        super().__init__()
+        self.engine = engine
+        self.max_checkpoints = max_checkpoints
+        self.ttl = ttl
+        self.evict_every = evict_every
+        self._puts = 0
+
+    # --- helpers ---
+
+    @staticmethod
+    def _thread(config: RunnableConfig) -> Tuple[str, str]:
+        configurable = config["configurable"]
+        return configurable["thread_id"], configurable.get("checkpoint_ns", "")
+
+    @staticmethod
+    def _config(thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> RunnableConfig:
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}}
+
+    def _to_tuple(self, session: Session, row: models.AgentCheckpoint) -> CheckpointTuple:
+        writes = session.scalars(
+            select(models.AgentCheckpointWrite).where(
+                models.AgentCheckpointWrite.thread_id == row.thread_id,
+                models.AgentCheckpointWrite.checkpoint_ns == row.checkpoint_ns,
+                models.AgentCheckpointWrite.checkpoint_id == row.checkpoint_id,
+            ).order_by(models.AgentCheckpointWrite.task_id, models.AgentCheckpointWrite.idx)
+        ).all()
+        return CheckpointTuple(
+            config=self._config(row.thread_id, row.checkpoint_ns, row.checkpoint_id),
+            checkpoint=self.serde.loads_typed((row.type, row.checkpoint)),
+            metadata=self.serde.loads_typed((row.metadata_type, row.checkpoint_metadata)),
+            parent_config=(
+                self._config(row.thread_id, row.checkpoint_ns, row.parent_checkpoint_id)
+                if row.parent_checkpoint_id else None
+            ),
+            pending_writes=[
+                (write.task_id, write.channel, self.serde.loads_typed((write.type, write.value)))
+                for write in writes
+            ],
+        )
+
+    def _compact(self, session: Session, thread_id: str, checkpoint_ns: str):
+        """Drop all but the newest `max_checkpoints` checkpoints of a thread, with their writes."""
+        stale_ids = session.scalars(
+            select(models.AgentCheckpoint.checkpoint_id).where(
+                models.AgentCheckpoint.thread_id == thread_id,
+                models.AgentCheckpoint.checkpoint_ns == checkpoint_ns,
+            ).order_by(models.AgentCheckpoint.checkpoint_id.desc()).offset(self.max_checkpoints)
+        ).all()
+        if not stale_ids:
+            return
+        for model in (models.AgentCheckpointWrite, models.AgentCheckpoint):
+            session.execute(delete(model).where(
+                model.thread_id == thread_id,
+                model.checkpoint_ns == checkpoint_ns,
+                model.checkpoint_id.in_(stale_ids),
+            ))
+
+    def evict_expired(self):
+        """Delete checkpoints and writes older than the TTL; idle threads disappear entirely."""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl)
+        with Session(self.engine) as session, session.begin():
+            for model in (models.AgentCheckpointWrite, models.AgentCheckpoint):
+                session.execute(delete(model).where(model.created_at < cutoff))
+
+    def delete_thread(self, thread_id: str):
+        with Session(self.engine) as session, session.begin():
+            for model in (models.AgentCheckpointWrite, models.AgentCheckpoint):
+                session.execute(delete(model).where(model.thread_id == thread_id))
+
+    # --- BaseCheckpointSaver API ---
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id, checkpoint_ns = self._thread(config)
+        checkpoint_id = config["configurable"].get("checkpoint_id")
+        query = select(models.AgentCheckpoint).where(
+            models.AgentCheckpoint.thread_id == thread_id,
+            models.AgentCheckpoint.checkpoint_ns == checkpoint_ns,
+        )
+        if checkpoint_id:
+            query = query.where(models.AgentCheckpoint.checkpoint_id == checkpoint_id)
+        else:
+            query = query.order_by(models.AgentCheckpoint.checkpoint_id.desc()).limit(1)
+
+        with Session(self.engine) as session:
+            row = session.scalar(query)
+            return self._to_tuple(session, row) if row is not None else None
+
+    def list(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+             before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        query = select(models.AgentCheckpoint).order_by(models.AgentCheckpoint.checkpoint_id.desc())
+        if config is not None:
+            thread_id, checkpoint_ns = self._thread(config)
+            query = query.where(
+                models.AgentCheckpoint.thread_id == thread_id,
+                models.AgentCheckpoint.checkpoint_ns == checkpoint_ns,
+            )
+        if before is not None:
+            query = query.where(models.AgentCheckpoint.checkpoint_id < before["configurable"]["checkpoint_id"])
+
+        with Session(self.engine) as session:
+            returned = 0
+            for row in session.scalars(query):
+                item = self._to_tuple(session, row)
+                # Metadata is stored serialized, so filters are applied here
+                if filter and any(item.metadata.get(key) != value for key, value in filter.items()):
+                    continue
+                yield item
+                returned += 1
+                if limit is not None and returned >= limit:
+                    return
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+            new_versions: ChannelVersions) -> RunnableConfig:
+        thread_id, checkpoint_ns = self._thread(config)
+        checkpoint_type, checkpoint_data = self.serde.dumps_typed(checkpoint)
+        # The per-request DB session travels in the run config and is never persisted
+        metadata = {key: value for key, value in metadata.items() if key != "db"}
+        metadata_type, metadata_data = self.serde.dumps_typed(metadata)
+
+        with Session(self.engine) as session, session.begin():
+            session.merge(models.AgentCheckpoint(
+                thread_id=thread_id,
+                checkpoint_ns=checkpoint_ns,
+                checkpoint_id=checkpoint["id"],
+                parent_checkpoint_id=config["configurable"].get("checkpoint_id"),
+                type=checkpoint_type,
+                checkpoint=checkpoint_data,
+                metadata_type=metadata_type,
+                checkpoint_metadata=metadata_data,
+                created_at=datetime.utcnow(),
+            ))
+            self._compact(session, thread_id, checkpoint_ns)
+
+        self._puts += 1
+        if self._puts % self.evict_every == 0:
+            self.evict_expired()
+
+        return self._config(thread_id, checkpoint_ns, checkpoint["id"])
+
+    def put_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str,
+                   task_path: str = "") -> None:
+        thread_id, checkpoint_ns = self._thread(config)
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        now = datetime.utcnow()
+        with Session(self.engine) as session, session.begin():
+            for idx, (channel, value) in enumerate(writes):
+                value_type, value_data = self.serde.dumps_typed(value)
+                session.merge(models.AgentCheckpointWrite(
+                    thread_id=thread_id,
+                    checkpoint_ns=checkpoint_ns,
+                    checkpoint_id=checkpoint_id,
+                    task_id=task_id,
+                    idx=WRITES_IDX_MAP.get(channel, idx),
+                    channel=channel,
+                    type=value_type,
+                    value=value_data,
+                    task_path=task_path,
+                    created_at=now,
+                ))
+
+    def get_next_version(self, current: Optional[str], channel) -> str:
+        # Same scheme as LangGraph's own savers: monotonically increasing, string-sortable
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # --- async API (the graph runs with ainvoke); blocking SQL goes to a thread ---
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+                    before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+                   new_versions: ChannelVersions) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str,
+                          task_path: str = "") -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+
+def create_checkpointer_from_env() -> SQLCheckpointSaver:
+    """
+    CHECKPOINT_DATABASE_URL: separate store (e.g. sqlite:///./checkpoints.db); defaults
+        to the main database, where the tables come from the Alembic migrations
+    AGENT_CHECKPOINT_HISTORY: checkpoints kept per thread (default 10)
+    AGENT_CHECKPOINT_TTL: seconds before an idle thread is evicted (default 7 days)
+    """
+    url = os.getenv("CHECKPOINT_DATABASE_URL")
+    if url:
+        engine = create_engine(url)
+        database.Base.metadata.create_all(bind=engine, tables=CHECKPOINT_TABLES)
+    else:
+        engine = database.engine
+    return SQLCheckpointSaver(
+        engine,
+        max_checkpoints=int(os.getenv("AGENT_CHECKPOINT_HISTORY", "10")),
+        ttl=int(os.getenv("AGENT_CHECKPOINT_TTL", str(7 * 24 * 3600))),
+    )
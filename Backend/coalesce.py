@@ -0,0 +1,37 @@
+# coalesce.py
+# Single-flight deduplication of identical concurrent async calls.
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Concurrent calls with the same key share one execution: the first caller
+    starts it, later callers await the same result until it completes. Once it
+    completes the key is released, so the next call computes afresh.
+
+    Waiters are shielded from each other: a caller that disconnects (and is
+    cancelled) does not cancel the shared computation for the others.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        future = self._inflight.get(key)
+        if future is None:
+            self.started += 1
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._release(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(future)
+
+    def _release(self, key: Hashable, done: asyncio.Future):
+        if self._inflight.get(key) is done:
+            del self._inflight[key]
@@ -0,0 +1,73 @@
+# context_builder.py
+# Fits task lists returned by agent tools into a token budget.
+#
+# Tool results are appended to the conversation and sent to the model again
+# in the final step, so an unbounded task list makes every prompt grow with
+# project size. The builder keeps the most relevant tasks (open, overdue,
+# high priority, recently changed) with truncated descriptions and rolls the
+# remainder up into counts.
+import json
+from collections import Counter
+from typing import Dict, List
+
+PRIORITY_RANK = {"high": 3, "medium": 2, "low": 1}
+
+# Budget reserved for the JSON wrapper and the rolled-up counts
+SUMMARY_OVERHEAD_TOKENS = 60
+
+
+def estimate_tokens(value) -> int:
+    """Rough token count (~4 characters per token) of a value's JSON form."""
+    return len(json.dumps(value, default=str)) // 4 + 1
+
+
+def relevance_key(task: Dict):
+    """Sort key, highest first: open, then overdue, then priority, then most recently changed."""
+    return (
+        task.get("status") != "done",
+        bool(task.get("overdue")),
+        PRIORITY_RANK.get((task.get("priority") or "").lower(), 0),
+        task.get("updated_at") or "",
+    )
+
+
+def _truncate(text, max_chars: int):
+    if not text or len(text) <= max_chars:
+        return text
+    return text[:max_chars].rstrip() + "..."
+
+
+def build_task_context(tasks: List[Dict], budget_tokens: int, description_chars: int = 160) -> Dict:
+    """
+    Select tasks for the model within `budget_tokens`.
+
+    Returns the kept tasks (most relevant first, descriptions truncated), counts
+    for the omitted ones, the estimated size of the result and the tokens saved
+    compared with sending every task in full.
+    """
+    ranked = sorted(tasks, key=relevance_key, reverse=True)
+
+    selected = []
+    used = SUMMARY_OVERHEAD_TOKENS
+    for task in ranked:
+        compact = dict(task, description=_truncate(task.get("description"), description_chars))
+        cost = estimate_tokens(compact)
+        if used + cost > budget_tokens:
+            break
+        selected.append(compact)
+        used += cost
+
+    omitted = ranked[len(selected):]
+    result = {
+        "tasks": selected,
+        "total_tasks": len(tasks),
+        "omitted": {
+            "count": len(omitted),
+            "by_status": dict(Counter(task.get("status") for task in omitted)),
+            "by_priority": dict(Counter(task.get("priority") for task in omitted)),
+            "overdue": sum(1 for task in omitted if task.get("overdue")),
+        },
+    }
+    result["token_estimate"] = estimate_tokens(result)
+    result["tokens_saved"] = max(estimate_tokens(tasks) - result["token_estimate"], 0)
+    return result
@@ -0,0 +1,175 @@
+# db_pool.py
+# Named connection pool profiles and pool checkout telemetry.
+#
+# DB_POOL_PROFILE picks one of POOL_PROFILES for both engines (a profile can
+# size the sync and async pools differently); individual settings can be
+# overridden for both with DB_POOL_SIZE, DB_MAX_OVERFLOW,
+# DB_POOL_TIMEOUT, DB_POOL_RECYCLE and DB_POOL_PRE_PING. The queue pools are
+# subclassed to time every checkout, so wait time, timeouts and utilization
+# can be read from pool_status() and the /metrics pool gauges.
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Dict
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+POOL_PROFILES = {
+    # SQLAlchemy's sizes, plus pre-ping and recycle so connections dropped by an
+    # RDS failover or idle timeout are replaced instead of failing a request
+    "default": {"pool_size": 5, "max_overflow": 10, "pool_timeout": 30, "pool_recycle": 1800, "pool_pre_ping": True},
+    # Production API. The two engines see different concurrency:
+    # - sync: the /ai/* routes' sessions and the agent tools, whose SQL runs in
+    #   asyncio.to_thread, i.e. the default executor's min(32, cpu_count + 4)
+    #   threads. A parallel tool step opens one extra session per tool call,
+    #   and sessions stay open across LLM calls, hence the larger overflow.
+    # - async: the CRUD routes, one session per request, with no thread limit;
+    #   in-flight requests bound it, so size for peak concurrent requests and
+    #   let pool_timeout shed load beyond that.
+    "web": {"pool_timeout": 10, "pool_recycle": 1800, "pool_pre_ping": True,
+            "sync": {"pool_size": 10, "max_overflow": 20},
+            "async": {"pool_size": 20, "max_overflow": 20}},
+    # Absorb short spikes with overflow connections, and fail fast rather than queue
+    "burst": {"pool_size": 10, "max_overflow": 40, "pool_timeout": 3, "pool_recycle": 600, "pool_pre_ping": True},
+    # Behind PgBouncer in transaction mode: PgBouncer does the pooling, and
+    # server-side prepared statements are disabled since backends are shared
+    "pgbouncer": {"pool_size": 5, "max_overflow": 5, "pool_timeout": 10, "pool_recycle": 300,
+                  "pool_pre_ping": True, "pgbouncer": True},
+    # Tests and one-off scripts: no pooling, each checkout opens a new connection
+    "test": {"poolclass": NullPool},
+}
+
+ENV_OVERRIDES = {
+    "DB_POOL_SIZE": ("pool_size", int),
+    "DB_MAX_OVERFLOW": ("max_overflow", int),
+    "DB_POOL_TIMEOUT": ("pool_timeout", float),
+    "DB_POOL_RECYCLE": ("pool_recycle", int),
+    "DB_POOL_PRE_PING": ("pool_pre_ping", lambda value: value.lower() in ("1", "true", "yes")),
+}
+
+
+class PoolStats:
+    """Checkout counts and wait times of one pool; the last WINDOW waits feed the percentiles."""
+
+    WINDOW = 1000
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._recent = deque(maxlen=self.WINDOW)
+        self._lock = threading.Lock()
+
+    def record(self, wait: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+            self._recent.append(wait)
+
+    def recent_percentile(self, fraction: float) -> float:
+        with self._lock:
+            waits = sorted(self._recent)
+        if not waits:
+            return 0.0
+        return waits[min(len(waits) - 1, int(fraction * len(waits)))]
+
+
+class _TimedCheckout:
+    """Times QueuePool._do_get, i.e. how long a caller waits for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self):
+        # Engine.dispose() and invalidation replace the pool; keep the counters
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - started)
+        return connection
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(url: str, is_async: bool, profile: str = None) -> Dict:
+    """create_engine / create_async_engine keyword arguments for a pool profile."""
+    name = (profile or os.getenv("DB_POOL_PROFILE", "default")).lower()
+    if name not in POOL_PROFILES:
+        raise ValueError(f"Unknown DB_POOL_PROFILE {name!r}; expected one of: {', '.join(POOL_PROFILES)}")
+
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # In-memory SQLite lives in a single connection; keep SQLAlchemy's pool for it
+        return {}
+
+    settings = dict(POOL_PROFILES[name])
+    if settings.get("poolclass") is NullPool:
+        return settings
+    per_engine = settings.pop("async", {}), settings.pop("sync", {})
+    settings.update(per_engine[0] if is_async else per_engine[1])
+
+    pgbouncer = settings.pop("pgbouncer", False)
+    for variable, (key, cast) in ENV_OVERRIDES.items():
+        value = os.getenv(variable)
+        if value:
+            settings[key] = cast(value)
+    settings["poolclass"] = TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool
+
+    # psycopg2 (sync engine) never prepares statements server-side; asyncpg does by default
+    if pgbouncer and is_async and parsed.get_backend_name() == "postgresql":
+        settings["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    return settings
+
+
+def pool_status(pool) -> Dict:
+    """Current occupancy and checkout wait statistics of a pool."""
+    status = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        # max_overflow=-1 means unbounded
+        capacity = pool.size() + pool._max_overflow if pool._max_overflow >= 0 else None
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "capacity": capacity,
+            "utilization": round(pool.checkedout() / capacity, 3) if capacity else None,
+        })
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update({
+            "checkouts": stats.checkouts,
+            "timeouts": stats.timeouts,
+            "wait_ms_avg": round(1000 * stats.wait_seconds_total / max(stats.checkouts + stats.timeouts, 1), 3),
+            "wait_ms_p95": round(1000 * stats.recent_percentile(0.95), 3),
+            "wait_ms_max": round(1000 * stats.wait_seconds_max, 3),
+        })
+    return status
@@ -0,0 +1,174 @@
+# fast_path.py
+# Deterministic answers for structured assistant queries.
+#
+# Queries like "what's overdue?" or "project summary" have a fixed answer
+# shape, so they are served straight from SQL aggregates with templated text
+# instead of two LLM round trips. Anything open-ended returns None and goes
+# through the agent graph as before.
+import os
+import re
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+import models
+import project_stats
+import queries
+
+ENABLED = os.getenv("AGENT_FAST_PATH", "1") != "0"
+
+# Only short queries that ask for a listing or a summary qualify
+MAX_QUERY_WORDS = 12
+OPEN_ENDED = re.compile(r"\b(why|how|should|could|suggest|recommend|improve|plan|help|explain|analy[sz]e|create|add|update)\b")
+OVERDUE_QUERY = re.compile(r"\b(overdue|past due|late|missed deadlines?)\b")
+SUMMARY_QUERY = re.compile(r"\b(summary|summarize|overview|status report|project status|progress report)\b")
+
+OVERDUE_LIST_LIMIT = 10
+UPCOMING_DAYS = 7
+
+
+def match_intent(query: str, request_type: str) -> Optional[str]:
+    """
+    Map a query to a fast-path intent ("overdue" or "summary"), or None when it
+    needs the LLM. `request_type` is ProjectManagerAgent._classify_request's bucket.
+    """
+    text = query.lower()
+    if len(text.split()) > MAX_QUERY_WORDS or OPEN_ENDED.search(text):
+        return None
+    if request_type in ("deadline_management", "status_update") and OVERDUE_QUERY.search(text):
+        return "overdue"
+    if request_type in ("project_overview", "status_update") and SUMMARY_QUERY.search(text):
+        return "summary"
+    return None
+
+
+def _result(text: str, intent: str, data: Dict, user_id: str, project_id: Optional[str]) -> Dict:
+    """Same shape as the agent graph's result, flagged as a fast-path answer."""
+    return {
+        "response": text,
+        "action_taken": False,
+        "context": {
+            "user_id": user_id,
+            "project_id": project_id,
+            "request_type": intent,
+            "fast_path": True,
+            "timestamp": datetime.now().isoformat()
+        },
+        "data": data
+    }
+
+
+def _can_access(db: Session, user_id: str, project_id: str) -> bool:
+    """Owner or collaborator of the project (the frontend lists both kinds of project)."""
+    project = db.get(models.Project, project_id)
+    return project is not None and (project.owner_id == user_id or user_id in (project.collaborators or []))
+
+
+def _overdue_rows(db: Session, user_id: str, now: datetime, project_id: Optional[str]):
+    """Up to OVERDUE_LIST_LIMIT overdue tasks, most overdue first, and whether more exist."""
+    rows = db.execute(queries.overdue_tasks(
+        user_id, now, limit=OVERDUE_LIST_LIMIT + 1, project_id=project_id
+    )).all()
+    return rows[:OVERDUE_LIST_LIMIT], len(rows) > OVERDUE_LIST_LIMIT
+
+
+def _overdue_count(rows, more: bool) -> str:
+    return f"more than {OVERDUE_LIST_LIMIT}, {OVERDUE_LIST_LIMIT} most overdue shown" if more else str(len(rows))
+
+
+def _overdue_lines(rows) -> str:
+    return "\n".join(
+        f"- {row.title} ({row.project}): {int(row.days_overdue)} days overdue, "
+        f"assigned to {row.assignee_name or 'nobody'}"
+        for row in rows
+    )
+
+
+def answer_overdue(db: Session, user_id: str, project_id: Optional[str]) -> Dict:
+    rows, more = _overdue_rows(db, user_id, datetime.now(), project_id)
+    if not rows:
+        text = "Nothing is overdue right now."
+    elif more:
+        text = f"More than {OVERDUE_LIST_LIMIT} overdue tasks; the {OVERDUE_LIST_LIMIT} most overdue:\n{_overdue_lines(rows)}"
+    else:
+        text = f"{len(rows)} overdue task{'s' if len(rows) != 1 else ''}, most overdue first:\n{_overdue_lines(rows)}"
+    data = {
+        "overdue_tasks": [
+            {"id": row.id, "title": row.title, "project": row.project, "days_overdue": int(row.days_overdue)}
+            for row in rows
+        ],
+        "more_overdue": more
+    }
+    return _result(text, "overdue", data, user_id, project_id)
+
+
+def answer_summary(db: Session, user_id: str, project_id: str) -> Optional[Dict]:
+    project = db.get(models.Project, project_id)
+    if project is None:
+        return None
+    stats = db.get(models.ProjectStats, project_id)
+    total = stats.total_count if stats else 0
+    todo = stats.todo_count if stats else 0
+    in_progress = stats.in_progress_count if stats else 0
+    done = stats.done_count if stats else 0
+    overdue = db.scalar(project_stats.overdue_count_query(project_id, datetime.now())) or 0
+    busiest = db.execute(queries.busiest_assignees(project_id)).all()
+
+    if total == 0:
+        text = f"{project.name} has no tasks yet."
+    else:
+        text = (
+            f"{project.name}: {total} tasks ({todo} to do, {in_progress} in progress, {done} done), "
+            f"{round(100 * done / total)}% complete. {overdue} overdue."
+        )
+        if busiest:
+            text += " Most open work: " + ", ".join(f"{row.username} ({row.open_count})" for row in busiest) + "."
+    data = {
+        "total": total, "todo": todo, "in_progress": in_progress, "done": done, "overdue": overdue,
+        "open_by_assignee": {row.username: row.open_count for row in busiest}
+    }
+    return _result(text, "summary", data, user_id, project_id)
+
+
+def answer_deadline_alert(db: Session, user_id: str, project_id: str) -> Optional[Dict]:
+    """
+    The deadline_alert workflow automation: overdue work plus what is due soon.
+    None when the user can't see the project, so the caller falls back to the LLM.
+    """
+    if not _can_access(db, user_id, project_id):
+        return None
+    now = datetime.now()
+    overdue, more = _overdue_rows(db, user_id, now, project_id)
+    upcoming = db.execute(queries.upcoming_tasks(project_id, now, now + timedelta(days=UPCOMING_DAYS))).all()
+
+    sections = []
+    if overdue:
+        sections.append(f"Overdue ({_overdue_count(overdue, more)}):\n{_overdue_lines(overdue)}")
+    if upcoming:
+        sections.append(f"Due in the next {UPCOMING_DAYS} days ({len(upcoming)}):\n" + "\n".join(
+            f"- {row.title}: due {row.deadline:%Y-%m-%d}, {row.priority or 'no'} priority, "
+            f"assigned to {row.assignee_name or 'nobody'}"
+            for row in upcoming
+        ))
+    text = "\n\n".join(sections) if sections else f"No overdue tasks and nothing due in the next {UPCOMING_DAYS} days."
+    data = {
+        "overdue_tasks": [{"id": row.id, "title": row.title, "days_overdue": int(row.days_overdue)} for row in overdue],
+        "more_overdue": more,
+        "upcoming_tasks": [{"id": row.id, "title": row.title, "deadline": row.deadline.isoformat()} for row in upcoming]
+    }
+    return _result(text, "deadline_alert", data, user_id, project_id)
+
+
+def try_answer(db: Session, user_id: str, query: str, project_id: Optional[str], request_type: str) -> Optional[Dict]:
+    """Answer a query deterministically, or return None to fall back to the LLM."""
+    if not ENABLED:
+        return None
+    intent = match_intent(query, request_type)
+    if project_id and intent and not _can_access(db, user_id, project_id):
+        return None
+    if intent == "overdue":
+        return answer_overdue(db, user_id, project_id)
+    if intent == "summary" and project_id:
+        return answer_summary(db, user_id, project_id)
+    return None
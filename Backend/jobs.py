@@ -0,0 +1,216 @@
+# jobs.py
+# Background execution of the long-running AI endpoints.
+#
+# POST /ai/jobs submits a job and returns its id immediately; GET /ai/jobs/{id}
+# reports status and result. Two backends are available, selected by JOB_BACKEND:
+#   "memory" (default) - bounded asyncio worker pool inside the API process
+#   "celery"           - Celery workers with Redis as broker and result store;
+#                        run them with `celery -A jobs:celery_app worker`
+import asyncio
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional
+
+import database
+import query_counter
+import schemas
+
+def _agents():
+    """The AI stack is imported on first use, so importing jobs (and app) stays cheap"""
+    import agents
+    return agents
+
+
+# Job kind -> coroutine running it with its own DB session
+JOB_HANDLERS = {
+    "project_insights": lambda p, db: _agents().ai_project_insights(p["user_id"], p["project_id"], db),
+    "workflow_automation": lambda p, db: _agents().ai_run_workflow_automation(
+        p["user_id"], p["project_id"], p.get("automation_type") or "", db
+    ),
+    "team_insights": lambda p, db: _agents().ai_analyze_team(p["user_id"], p.get("project_id"), db),
+    "smart_task_creation": lambda p, db: _agents().ai_smart_task_creation(
+        p["user_id"], p["project_id"], p.get("description") or "", db, p.get("auto_create", False)
+    ),
+}
+
+
+class JobQueueFull(Exception):
+    """Raised when the in-process queue has no room for another job."""
+
+
+async def run_job(kind: str, params: Dict) -> Dict:
+    """Execute a job. The request's session is gone by now, so the job opens its own."""
+    # Not part of the submitting request's tally, which an in-process job would inherit
+    with query_counter.track(nested=False) as stats, database.session_scope() as db:
+        result = await JOB_HANDLERS[kind](params, db)
+    query_counter.check(stats, f"job {kind}")
+    return result
+
+
+class InProcessJobBackend:
+    """
+    Runs jobs as asyncio tasks on the API's event loop, at most `max_workers`
+    at a time. Finished jobs are kept for `result_ttl` seconds (and at most
+    `max_jobs` records) so clients can poll for them.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 100,
+                 max_jobs: int = 1000, result_ttl: int = 3600):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_jobs = max_jobs
+        self.result_ttl = result_ttl
+        self._jobs: "OrderedDict[str, schemas.AIJob]" = OrderedDict()
+        self._tasks = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def submit(self, kind: str, params: Dict) -> schemas.AIJob:
+        pending = sum(1 for job in self._jobs.values() if job.status in ("queued", "running"))
+        if pending >= self.max_pending:
+            raise JobQueueFull(f"{pending} jobs already queued or running")
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+
+        self._prune()
+        job = schemas.AIJob(id=str(uuid.uuid4()), kind=kind, status="queued", created_at=datetime.utcnow())
+        self._jobs[job.id] = job
+        task = asyncio.create_task(self._run(job, params))
+        # Keep a reference so the task isn't garbage collected mid-flight
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def get(self, job_id: str) -> Optional[schemas.AIJob]:
+        return self._jobs.get(job_id)
+
+    async def _run(self, job: schemas.AIJob, params: Dict):
+        async with self._semaphore:
+            job.status = "running"
+            job.started_at = datetime.utcnow()
+            try:
+                job.result = await run_job(job.kind, params)
+                job.status = "succeeded"
+            except Exception as e:
+                print(f"Error in job {job.id} ({job.kind}): {str(e)}")
+                job.error = str(e)
+                job.status = "failed"
+            job.finished_at = datetime.utcnow()
+
+    def _prune(self):
+        """Forget finished jobs past their TTL, then the oldest finished ones over max_jobs."""
+        now = datetime.utcnow()
+        finished = [job for job in self._jobs.values() if job.finished_at is not None]
+        for job in finished:
+            if (now - job.finished_at).total_seconds() > self.result_ttl:
+                del self._jobs[job.id]
+        for job in finished:
+            if len(self._jobs) < self.max_jobs:
+                break
+            self._jobs.pop(job.id, None)
+
+
+# Celery task states -> job status. PENDING is what Celery reports for ids it
+# has no record of, so it is not mapped: submit() stores RECEIVED up front.
+CELERY_STATUS = {
+    "RECEIVED": "queued",
+    "RETRY": "queued",
+    "STARTED": "running",
+    "SUCCESS": "succeeded",
+    "FAILURE": "failed",
+    "REVOKED": "failed",
+}
+
+
+_worker_loops = threading.local()
+
+
+def _worker_loop() -> asyncio.AbstractEventLoop:
+    """
+    One event loop per Celery worker process (per thread with `-P threads`),
+    kept for the life of the process. The async engine's pooled connections and
+    other loop-bound clients are reused across jobs, which asyncio.run() per
+    job would break by closing their loop. Checked against the pid because a
+    prefork child inherits module state from its parent.
+    """
+    loop = getattr(_worker_loops, "loop", None)
+    if loop is None or loop.is_closed() or _worker_loops.pid != os.getpid():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        _worker_loops.loop = loop
+        _worker_loops.pid = os.getpid()
+    return loop
+
+
+class CeleryJobBackend:
+    """Hands jobs to Celery workers; status and results live in the Redis result backend."""
+
+    def __init__(self, broker_url: str, result_backend: str, result_ttl: int = 3600):
+        from celery import Celery  # Only needed when the broker backend is selected
+
+        self.app = Celery("planora", broker=broker_url, backend=result_backend)
+        self.app.conf.update(
+            task_track_started=True,
+            result_expires=result_ttl,
+            task_serializer="json",
+            result_serializer="json",
+        )
+        self.task = self.app.task(name="planora.run_ai_job")(self._execute)
+
+    @staticmethod
+    def _execute(kind: str, params: Dict) -> Dict:
+        return _worker_loop().run_until_complete(run_job(kind, params))
+
+    def _mark_queued(self, job_id: str):
+        self.app.backend.store_result(job_id, None, "RECEIVED")
+
+    async def submit(self, kind: str, params: Dict) -> schemas.AIJob:
+        job_id = str(uuid.uuid4())
+        # Record the job before queueing it, so get() can tell it from an unknown id
+        await asyncio.to_thread(self._mark_queued, job_id)
+        await asyncio.to_thread(self.task.apply_async, args=(kind, params), task_id=job_id)
+        return schemas.AIJob(id=job_id, kind=kind, status="queued", created_at=datetime.utcnow())
+
+    async def get(self, job_id: str) -> Optional[schemas.AIJob]:
+        result = self.app.AsyncResult(job_id)
+        state, value = await asyncio.to_thread(lambda: (result.state, result.result))
+        if state not in CELERY_STATUS:
+            # Never submitted, or expired from the result backend
+            return None
+        job = schemas.AIJob(id=job_id, status=CELERY_STATUS[state])
+        if state == "SUCCESS":
+            job.result = value
+        elif state in ("FAILURE", "REVOKED"):
+            job.error = str(value)
+        return job
+
+
+def create_job_backend_from_env():
+    """
+    JOB_BACKEND: "memory" (default) or "celery"
+    JOB_MAX_WORKERS / JOB_MAX_PENDING: in-process pool size and queue bound
+    JOB_RESULT_TTL: seconds finished jobs stay retrievable (default 3600)
+    CELERY_BROKER_URL / CELERY_RESULT_BACKEND: default to REDIS_URL
+    """
+    result_ttl = int(os.getenv("JOB_RESULT_TTL", "3600"))
+    if os.getenv("JOB_BACKEND", "memory").lower() == "celery":
+        redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        return CeleryJobBackend(
+            os.getenv("CELERY_BROKER_URL", redis_url),
+            os.getenv("CELERY_RESULT_BACKEND", redis_url),
+            result_ttl,
+        )
+    return InProcessJobBackend(
+        max_workers=int(os.getenv("JOB_MAX_WORKERS", "4")),
+        max_pending=int(os.getenv("JOB_MAX_PENDING", "100")),
+        result_ttl=result_ttl,
+    )
+
+
+# Global instance
+job_backend = create_job_backend_from_env()
+
+# Entry point for `celery -A jobs:celery_app worker` (None with the in-process backend)
+celery_app = getattr(job_backend, "app", None)
@@ -0,0 +1,231 @@
+# llm_cache.py
+# Content-addressed cache for LLM completions.
+#
+# Keys are a hash of the model name, temperature and rendered prompt, so a
+# change to any input that ends up in the prompt naturally misses the cache.
+# Entries can also carry tags (e.g. "task:<id>") which are invalidated once
+# a transaction that updated or deleted the underlying row commits.
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+import models
+
+
+def cache_key(model: str, temperature: float, prompt: str) -> str:
+    """Stable key for a single-prompt completion."""
+    payload = json.dumps({"model": model, "temperature": temperature, "prompt": prompt}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class InMemoryCacheBackend:
+    """Per-process LRU cache with per-entry TTL."""
+
+    # Lookups only take a lock, so they are safe to run on the event loop
+    blocking = False
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, tuple[float, str, tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value, _ = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: int, tags: Iterable[str] = ()):
+        tags = tuple(tags)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_tag(self, tag: str):
+        with self._lock:
+            for key in self._tags.pop(tag, set()):
+                self._remove(key)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisCacheBackend:
+    """
+    Shared cache in Redis. TTLs are enforced by Redis; configure the server with
+    an LRU maxmemory-policy (e.g. allkeys-lru) to bound its size.
+    """
+
+    # Every call is a network round trip; async callers run them in a worker thread
+    blocking = True
+
+    def __init__(self, url: str, prefix: str = "planora:llm:"):
+        import redis  # Only needed when the shared backend is selected
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(self.prefix + key)
+        return value.decode() if value is not None else None
+
+    def set(self, key: str, value: str, ttl: int, tags: Iterable[str] = ()):
+        pipe = self.client.pipeline()
+        pipe.set(self.prefix + key, value, ex=ttl)
+        for tag in tags:
+            tag_key = f"{self.prefix}tag:{tag}"
+            pipe.sadd(tag_key, key)
+            pipe.expire(tag_key, ttl)
+        pipe.execute()
+
+    def invalidate_tag(self, tag: str):
+        tag_key = f"{self.prefix}tag:{tag}"
+        keys = self.client.smembers(tag_key)
+        self.client.delete(tag_key, *[self.prefix + key.decode() for key in keys])
+
+
+class LLMCache:
+    """Front end used by the agents; backend selection comes from the environment."""
+
+    def __init__(self, backend=None, ttl: int = 3600):
+        self.backend = backend
+        self.ttl = ttl
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        try:
+            return self.backend.get(key)
+        except Exception as e:
+            print(f"LLM cache read failed: {e}")
+            return None
+
+    def set(self, key: str, value: str, tags: Iterable[str] = ()):
+        if not self.enabled:
+            return
+        try:
+            self.backend.set(key, value, self.ttl, tags)
+        except Exception as e:
+            print(f"LLM cache write failed: {e}")
+
+    def invalidate_tag(self, tag: str):
+        if not self.enabled:
+            return
+        try:
+            self.backend.invalidate_tag(tag)
+        except Exception as e:
+            print(f"LLM cache invalidation failed: {e}")
+
+    def invalidate_tags(self, tags: Iterable[str]):
+        for tag in tags:
+            self.invalidate_tag(tag)
+
+    @property
+    def blocking(self) -> bool:
+        return getattr(self.backend, "blocking", False)
+
+    async def aget(self, key: str) -> Optional[str]:
+        """get() for coroutines; blocking backends are called from a worker thread."""
+        if self.blocking:
+            return await asyncio.to_thread(self.get, key)
+        return self.get(key)
+
+    async def aset(self, key: str, value: str, tags: Iterable[str] = ()):
+        if self.blocking:
+            await asyncio.to_thread(self.set, key, value, tuple(tags))
+        else:
+            self.set(key, value, tags)
+
+
+def create_cache_from_env() -> LLMCache:
+    """
+    LLM_CACHE_BACKEND: "memory" (default), "redis" or "none"
+    LLM_CACHE_TTL: entry lifetime in seconds (default 3600)
+    LLM_CACHE_MAXSIZE: max entries for the in-memory backend (default 1024)
+    REDIS_URL: connection URL for the redis backend
+    """
+    kind = os.getenv("LLM_CACHE_BACKEND", "memory").lower()
+    ttl = int(os.getenv("LLM_CACHE_TTL", "3600"))
+    if kind == "none":
+        return LLMCache(None, ttl)
+    if kind == "redis":
+        try:
+            return LLMCache(RedisCacheBackend(os.getenv("REDIS_URL", "redis://localhost:6379/0")), ttl)
+        except Exception as e:
+            print(f"Error configuring Redis LLM cache: {e}. Falling back to in-memory cache.")
+    return LLMCache(InMemoryCacheBackend(int(os.getenv("LLM_CACHE_MAXSIZE", "1024"))), ttl)
+
+
+# Global instance
+llm_cache = create_cache_from_env()
+
+
+def task_tag(task_id: str) -> str:
+    return f"task:{task_id}"
+
+
+PENDING_TAGS = "llm_cache_pending_tags"
+
+
+@event.listens_for(models.Task, "after_update")
+@event.listens_for(models.Task, "after_delete")
+def _queue_task_invalidation(mapper, connection, target):
+    """Remember changed tasks at flush; their cached analyses are dropped on commit."""
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(PENDING_TAGS, set()).add(task_tag(target.id))
+    else:
+        llm_cache.invalidate_tag(task_tag(target.id))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    tags = session.info.pop(PENDING_TAGS, None)
+    if not tags:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if loop is not None and llm_cache.blocking:
+        # Committed from an AsyncSession: keep the Redis round trips off the event loop
+        loop.run_in_executor(None, llm_cache.invalidate_tags, tags)
+    else:
+        llm_cache.invalidate_tags(tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    # The rows never changed, so the cached analyses are still valid
+    session.info.pop(PENDING_TAGS, None)
@@ -0,0 +1,251 @@
+# llm_provider.py
+# Chat model construction for the agents, with record/replay of model calls.
+#
+# LLM_MODE=live (default) talks to Gemini directly. record does the same but
+# appends every call (prompt messages, tool calls, response, latency) to a
+# cassette file; replay serves calls from that cassette without network
+# access, optionally with synthetic latency, so graph, tool and DB overhead
+# can be profiled and compared across changes in CI.
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+import metrics
+
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+
+class CassetteMiss(LookupError):
+    """Replay mode got a call that was never recorded."""
+
+
+def _message_key(message: BaseMessage, loose: bool) -> List:
+    tool_calls = [[call["name"], call["args"]] for call in getattr(message, "tool_calls", None) or []]
+    if loose and isinstance(message, ToolMessage):
+        # Tool results contain live data (dates, counts) that drift between runs
+        return [message.type, message.name]
+    if loose:
+        tool_calls = [name for name, _ in tool_calls]
+    return [message.type, message.content, tool_calls]
+
+
+def call_key(model: str, temperature: float, tools: List[str], messages: List[BaseMessage], loose: bool = False) -> str:
+    """
+    Stable key for one model call. Tool call ids are left out since the live API
+    generates them; the loose key also ignores tool result contents and is used
+    when the exact key misses.
+    """
+    payload = json.dumps({
+        "model": model,
+        "temperature": temperature,
+        "tools": sorted(tools),
+        "messages": [_message_key(message, loose) for message in messages],
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class Cassette:
+    """Recorded model calls in a JSON Lines file (gzip-compressed if the path ends in .gz)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with self._open("rt") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        # Later recordings of the same call win
+                        self._entries[entry["key"]] = entry
+                        self._entries.setdefault(entry["loose_key"], entry)
+
+    def _open(self, mode: str):
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode, encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    def get(self, key: str, loose_key: str) -> Optional[Dict]:
+        return self._entries.get(key) or self._entries.get(loose_key)
+
+    def append(self, entry: Dict):
+        with self._lock:
+            self._entries[entry["key"]] = entry
+            self._entries[entry["loose_key"]] = entry
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._open("at") as f:
+                f.write(json.dumps(entry, separators=(",", ":"), default=str) + "\n")
+
+    def __len__(self) -> int:
+        return len({entry["key"] for entry in self._entries.values()})
+
+
+class CassetteChatModel(BaseChatModel):
+    """
+    Records calls of a live model (`live` set) or replays them (`live` unset).
+    Exposes model/temperature like ChatGoogleGenerativeAI, so cache keys match.
+    """
+
+    model: str = DEFAULT_MODEL
+    temperature: float = 0.0
+    cassette: Any = None
+    live: Any = None
+    tool_names: List[str] = []
+    # Replay latency: a fixed number of seconds, or None to reuse the recorded latency
+    replay_latency: Optional[float] = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "cassette-record" if self.live is not None else "cassette-replay"
+
+    def bind_tools(self, tools, **kwargs):
+        live = self.live.bind_tools(tools, **kwargs) if self.live is not None else None
+        return self.model_copy(update={"live": live, "tool_names": [tool.name for tool in tools]})
+
+    def _keys(self, messages: List[BaseMessage]):
+        return (
+            call_key(self.model, self.temperature, self.tool_names, messages),
+            call_key(self.model, self.temperature, self.tool_names, messages, loose=True),
+        )
+
+    def _record(self, messages: List[BaseMessage], response: AIMessage, latency: float):
+        key, loose_key = self._keys(messages)
+        self.cassette.append({
+            "key": key,
+            "loose_key": loose_key,
+            "model": self.model,
+            "tools": self.tool_names,
+            "messages": [[message.type, message.content] for message in messages],
+            "response": {"content": response.content, "tool_calls": response.tool_calls},
+            "usage": response.usage_metadata,
+            "latency_ms": round(latency * 1000, 1),
+        })
+
+    def _replay(self, messages: List[BaseMessage]):
+        entry = self.cassette.get(*self._keys(messages))
+        if entry is None:
+            raise CassetteMiss(f"No recorded response for this {self.model} call in {self.cassette.path}")
+        latency = entry["latency_ms"] / 1000 if self.replay_latency is None else self.replay_latency
+        message = AIMessage(
+            content=entry["response"]["content"],
+            tool_calls=entry["response"]["tool_calls"],
+            usage_metadata=entry.get("usage"),
+        )
+        return message, latency
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs) -> ChatResult:
+        if self.live is not None:
+            started = time.perf_counter()
+            response = self.live.invoke(messages)
+            self._record(messages, response, time.perf_counter() - started)
+        else:
+            response, latency = self._replay(messages)
+            time.sleep(latency)
+        return ChatResult(generations=[ChatGeneration(message=response)])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs) -> ChatResult:
+        if self.live is not None:
+            started = time.perf_counter()
+            response = await self.live.ainvoke(messages)
+            self._record(messages, response, time.perf_counter() - started)
+        else:
+            response, latency = self._replay(messages)
+            await asyncio.sleep(latency)
+        return ChatResult(generations=[ChatGeneration(message=response)])
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """Latency, call and token counters for one chat model; attach via the model's callbacks."""
+
+    def __init__(self, model: str):
+        self.model = model
+        self._started: Dict[UUID, float] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs):
+        with self._lock:
+            self._started[run_id] = time.perf_counter()
+
+    def _finish(self, run_id: UUID) -> Optional[float]:
+        with self._lock:
+            started = self._started.pop(run_id, None)
+        return None if started is None else time.perf_counter() - started
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        elapsed = self._finish(run_id)
+        if elapsed is not None:
+            metrics.LLM_LATENCY.labels(self.model).observe(elapsed)
+        metrics.LLM_CALLS.labels(self.model, "ok").inc()
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                metrics.LLM_TOKENS.labels(self.model, "input").inc(usage.get("input_tokens", 0))
+                metrics.LLM_TOKENS.labels(self.model, "output").inc(usage.get("output_tokens", 0))
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs):
+        self._finish(run_id)
+        metrics.LLM_CALLS.labels(self.model, "error").inc()
+
+
+def _live_model(model: str, temperature: float) -> BaseChatModel:
+    return ChatGoogleGenerativeAI(
+        model=model,
+        google_api_key=os.getenv("GOOGLE_API_KEY"),
+        temperature=temperature
+    )
+
+
+_cassettes: Dict[str, Cassette] = {}
+_cassettes_lock = threading.Lock()
+
+
+def _cassette(path: str) -> Cassette:
+    """One Cassette per file, shared by every agent in the process."""
+    with _cassettes_lock:
+        if path not in _cassettes:
+            _cassettes[path] = Cassette(path)
+        return _cassettes[path]
+
+
+def create_chat_model(temperature: float, model: str = DEFAULT_MODEL) -> BaseChatModel:
+    """
+    LLM_MODE: "live" (default), "record" or "replay"
+    LLM_CASSETTE: cassette path (default cassettes/llm.jsonl; .gz to compress)
+    LLM_REPLAY_LATENCY_MS: delay per replayed call, or "recorded" (default 0)
+    """
+    mode = os.getenv("LLM_MODE", "live").lower()
+    if mode not in ("record", "replay"):
+        chat_model = _live_model(model, temperature)
+    else:
+        cassette = _cassette(os.getenv("LLM_CASSETTE", os.path.join("cassettes", "llm.jsonl")))
+        if mode == "record":
+            chat_model = CassetteChatModel(
+                model=model, temperature=temperature, cassette=cassette, live=_live_model(model, temperature)
+            )
+        else:
+            latency = os.getenv("LLM_REPLAY_LATENCY_MS", "0")
+            print(f"Replaying LLM calls from {cassette.path} ({len(cassette)} recorded)")
+            chat_model = CassetteChatModel(
+                model=model, temperature=temperature, cassette=cassette,
+                replay_latency=None if latency == "recorded" else float(latency) / 1000
+            )
+
+    # Latency/token metrics on the outermost model only, so recorded calls aren't counted twice
+    chat_model.callbacks = [LLMMetricsCallback(model)]
+    return chat_model
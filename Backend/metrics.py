@@ -0,0 +1,165 @@
+# metrics.py
+# Prometheus instrumentation, exposed by app.py at /metrics.
+#
+# Covers HTTP routes, LangGraph nodes, agent tools, SQL statements (grouped
+# by a literal-free fingerprint), LLM calls and the connection pools.
+import functools
+import re
+import time
+from typing import Any, Callable, Dict
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, REGISTRY
+from sqlalchemy import event
+
+import db_pool
+
+# Buckets tuned for SQL (sub-millisecond) up to multi-second LLM pipelines
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+ROUTE_LATENCY = Histogram(
+    "planora_http_request_duration_seconds", "HTTP request latency by route template",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS,
+)
+NODE_LATENCY = Histogram(
+    "planora_agent_node_duration_seconds", "LangGraph node latency",
+    ["node"], buckets=LATENCY_BUCKETS,
+)
+TOOL_LATENCY = Histogram(
+    "planora_agent_tool_duration_seconds", "Agent tool call latency",
+    ["tool", "status"], buckets=LATENCY_BUCKETS,
+)
+SQL_LATENCY = Histogram(
+    "planora_sql_statement_duration_seconds", "SQL statement latency by fingerprint",
+    ["engine", "fingerprint"], buckets=LATENCY_BUCKETS,
+)
+LLM_LATENCY = Histogram(
+    "planora_llm_call_duration_seconds", "Chat model call latency",
+    ["model"], buckets=LATENCY_BUCKETS,
+)
+LLM_CALLS = Counter("planora_llm_calls_total", "Chat model calls", ["model", "status"])
+LLM_TOKENS = Counter("planora_llm_tokens_total", "Chat model tokens", ["model", "kind"])
+CONTEXT_TOKENS_SAVED = Counter(
+    "planora_agent_context_tokens_saved_total", "Estimated prompt tokens saved by trimming tool results", ["tool"])
+CONTEXT_TASKS_DROPPED = Counter(
+    "planora_agent_context_tasks_dropped_total", "Tasks summarized as counts instead of listed in tool results", ["tool"])
+
+
+# --- SQL ---
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+|\?")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+FINGERPRINT_MAX_LENGTH = 200
+
+
+@functools.lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """
+    Statement with literals and bind parameters replaced by `?` and value lists
+    collapsed, so every execution of the same query shares one label.
+    """
+    text = _STRING_LITERAL.sub("?", statement)
+    text = _PLACEHOLDER.sub("?", text)
+    text = _NUMBER_LITERAL.sub("?", text)
+    text = _VALUE_LIST.sub("(?)", text)
+    return _WHITESPACE.sub(" ", text).strip()[:FINGERPRINT_MAX_LENGTH]
+
+
+def instrument_engine(engine, name: str):
+    """Time every statement of a (sync) engine; pass async_engine.sync_engine for async ones."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["metrics_started"].pop()
+        SQL_LATENCY.labels(name, fingerprint(statement)).observe(time.perf_counter() - started)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        # Keep the timing stack balanced when a statement fails
+        connection = context.connection
+        if connection is not None and connection.info.get("metrics_started"):
+            connection.info["metrics_started"].pop()
+
+
+class PoolCollector:
+    """Connection pool gauges, read from the pools at scrape time."""
+
+    def __init__(self):
+        self.engines: Dict[str, Any] = {}
+
+    def add(self, name: str, engine):
+        self.engines[name] = engine
+
+    def collect(self):
+        gauges = {
+            "size": GaugeMetricFamily("planora_db_pool_size", "Configured pool size", labels=["engine"]),
+            "checkedout": GaugeMetricFamily("planora_db_pool_checked_out", "Connections in use", labels=["engine"]),
+            "checkedin": GaugeMetricFamily("planora_db_pool_checked_in", "Idle connections in the pool", labels=["engine"]),
+            "overflow": GaugeMetricFamily("planora_db_pool_overflow", "Connections beyond pool_size", labels=["engine"]),
+        }
+        utilization = GaugeMetricFamily(
+            "planora_db_pool_utilization", "Checked-out share of pool_size + max_overflow", labels=["engine"])
+        wait_p95 = GaugeMetricFamily(
+            "planora_db_pool_checkout_wait_p95_seconds", "p95 checkout wait over recent checkouts", labels=["engine"])
+        checkouts = CounterMetricFamily("planora_db_pool_checkouts", "Pool checkouts", labels=["engine"])
+        timeouts = CounterMetricFamily("planora_db_pool_timeouts", "Checkouts that hit pool_timeout", labels=["engine"])
+        wait_total = CounterMetricFamily(
+            "planora_db_pool_checkout_wait_seconds", "Total time spent waiting for a connection", labels=["engine"])
+        for name, engine in self.engines.items():
+            for stat, gauge in gauges.items():
+                # NullPool/StaticPool don't keep these counters
+                reader = getattr(engine.pool, stat, None)
+                if reader is not None:
+                    gauge.add_metric([name], reader())
+            # Checkout timing from db_pool's timed pools
+            status = db_pool.pool_status(engine.pool)
+            if status.get("utilization") is not None:
+                utilization.add_metric([name], status["utilization"])
+            stats = getattr(engine.pool, "stats", None)
+            if stats is not None:
+                checkouts.add_metric([name], stats.checkouts)
+                timeouts.add_metric([name], stats.timeouts)
+                wait_total.add_metric([name], stats.wait_seconds_total)
+                wait_p95.add_metric([name], stats.recent_percentile(0.95))
+        return [*gauges.values(), utilization, wait_p95, checkouts, timeouts, wait_total]
+
+
+pool_collector = PoolCollector()
+REGISTRY.register(pool_collector)
+
+
+def instrument_database(database_module):
+    """SQL timings and pool gauges for the sync and async engines."""
+    instrument_engine(database_module.engine, "sync")
+    instrument_engine(database_module.async_engine.sync_engine, "async")
+    pool_collector.add("sync", database_module.engine)
+    pool_collector.add("async", database_module.async_engine.sync_engine)
+
+
+# --- Agents ---
+# (LLM call metrics are recorded by llm_provider.LLMMetricsCallback, which keeps
+# langchain out of this module's imports.)
+
+def timed_node(name: str, node: Callable) -> Callable:
+    """Wrap an async LangGraph node; the signature (incl. `config`) is kept for LangGraph."""
+
+    @functools.wraps(node)
+    async def wrapper(*args, **kwargs):
+        with NODE_LATENCY.labels(name).time():
+            return await node(*args, **kwargs)
+
+    return wrapper
+
+
+# --- Exposition ---
+
+def render():
+    """Prometheus text format of the default registry."""
+    return generate_latest(), CONTENT_TYPE_LATEST
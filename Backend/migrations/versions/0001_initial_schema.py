@@ -0,0 +1,68 @@
+"""Initial schema, as previously created by Base.metadata.create_all
+
+Databases that were created by the old create_all call at startup already
+have these tables; mark them with `alembic stamp 0001` instead of upgrading.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("clerkId", sa.String(), nullable=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    op.create_table(
+        "projects",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("owner_id", sa.String(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("collaborators", sa.ARRAY(sa.String()).with_variant(sa.JSON(), "sqlite"), nullable=True),
+    )
+    op.create_index("ix_projects_id", "projects", ["id"])
+    op.create_index("ix_projects_name", "projects", ["name"])
+
+    op.create_table(
+        "tasks",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("project_id", sa.String(), sa.ForeignKey("projects.id"), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.TIMESTAMP(), nullable=False),
+        sa.Column("deadline", sa.TIMESTAMP(), nullable=False),
+        sa.Column("priority", sa.Text(), nullable=True),
+        sa.Column("assigned_to_id", sa.String(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("status", sa.String(), nullable=False),
+    )
+    op.create_index("ix_tasks_id", "tasks", ["id"])
+
+    op.create_table(
+        "comments",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("task_id", sa.String(), sa.ForeignKey("tasks.id"), nullable=False),
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+    )
+    op.create_index("ix_comments_id", "comments", ["id"])
+
+
+def downgrade():
+    op.drop_table("comments")
+    op.drop_table("tasks")
+    op.drop_table("projects")
+    op.drop_table("users")
@@ -0,0 +1,39 @@
+"""Indexes for the hot task/comment/project filter paths
+
+Built with CREATE INDEX CONCURRENTLY on PostgreSQL so existing tables stay
+writable while the indexes are created.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, extra kwargs)
+INDEXES = [
+    ("ix_tasks_project_id_status", "tasks", ["project_id", "status"], {}),
+    ("ix_tasks_assigned_to_id_status", "tasks", ["assigned_to_id", "status"], {}),
+    ("ix_tasks_open_deadline", "tasks", ["deadline"],
+     {"postgresql_where": sa.text("status <> 'done'"), "sqlite_where": sa.text("status <> 'done'")}),
+    ("ix_comments_task_id", "comments", ["task_id"], {}),
+    ("ix_comments_user_id", "comments", ["user_id"], {}),
+    ("ix_projects_owner_id", "projects", ["owner_id"], {}),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True, **kwargs)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
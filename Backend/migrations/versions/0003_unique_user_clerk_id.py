@@ -0,0 +1,28 @@
+"""Unique index on users.clerkId
+
+Sign-in resolves users by Clerk id, so it needs an index probe. Duplicate
+clerkId values must be cleaned up before this migration can run.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_clerkId", "users", ["clerkId"],
+            unique=True, postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_users_clerkId", table_name="users", postgresql_concurrently=True, if_exists=True)
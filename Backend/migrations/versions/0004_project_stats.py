@@ -0,0 +1,59 @@
+"""project_stats and project_assignee_stats, backfilled from tasks
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "project_stats",
+        sa.Column("project_id", sa.String(), sa.ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("total_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("todo_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("in_progress_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("done_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("last_activity_at", sa.TIMESTAMP(), nullable=True),
+    )
+    op.create_table(
+        "project_assignee_stats",
+        sa.Column("project_id", sa.String(), sa.ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("assignee_id", sa.String(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("open_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+    op.execute("""
+        INSERT INTO project_stats
+            (project_id, total_count, todo_count, in_progress_count, done_count, version, last_activity_at)
+        SELECT p.id,
+               count(t.id),
+               count(t.id) FILTER (WHERE t.status = 'todo'),
+               count(t.id) FILTER (WHERE t.status = 'in_progress'),
+               count(t.id) FILTER (WHERE t.status = 'done'),
+               0,
+               max(t.created_at)
+        FROM projects p
+        LEFT JOIN tasks t ON t.project_id = p.id
+        GROUP BY p.id
+    """)
+    op.execute("""
+        INSERT INTO project_assignee_stats (project_id, assignee_id, open_count)
+        SELECT project_id, assigned_to_id, count(*)
+        FROM tasks
+        WHERE status <> 'done' AND assigned_to_id IS NOT NULL
+        GROUP BY project_id, assigned_to_id
+    """)
+
+
+def downgrade():
+    op.drop_table("project_assignee_stats")
+    op.drop_table("project_stats")
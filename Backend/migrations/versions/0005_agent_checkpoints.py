@@ -0,0 +1,49 @@
+"""Durable LangGraph checkpoint tables for agent conversations
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "agent_checkpoints",
+        sa.Column("thread_id", sa.String(), primary_key=True),
+        sa.Column("checkpoint_ns", sa.String(), primary_key=True),
+        sa.Column("checkpoint_id", sa.String(), primary_key=True),
+        sa.Column("parent_checkpoint_id", sa.String(), nullable=True),
+        sa.Column("type", sa.String(), nullable=True),
+        sa.Column("checkpoint", sa.LargeBinary(), nullable=False),
+        sa.Column("metadata_type", sa.String(), nullable=True),
+        sa.Column("checkpoint_metadata", sa.LargeBinary(), nullable=True),
+        sa.Column("created_at", sa.TIMESTAMP(), nullable=False),
+    )
+    op.create_index("ix_agent_checkpoints_created_at", "agent_checkpoints", ["created_at"])
+
+    op.create_table(
+        "agent_checkpoint_writes",
+        sa.Column("thread_id", sa.String(), primary_key=True),
+        sa.Column("checkpoint_ns", sa.String(), primary_key=True),
+        sa.Column("checkpoint_id", sa.String(), primary_key=True),
+        sa.Column("task_id", sa.String(), primary_key=True),
+        sa.Column("idx", sa.Integer(), primary_key=True),
+        sa.Column("channel", sa.String(), nullable=False),
+        sa.Column("type", sa.String(), nullable=True),
+        sa.Column("value", sa.LargeBinary(), nullable=True),
+        sa.Column("task_path", sa.String(), nullable=False, server_default=""),
+        sa.Column("created_at", sa.TIMESTAMP(), nullable=False),
+    )
+    op.create_index("ix_agent_checkpoint_writes_created_at", "agent_checkpoint_writes", ["created_at"])
+
+
+def downgrade():
+    op.drop_table("agent_checkpoint_writes")
+    op.drop_table("agent_checkpoints")
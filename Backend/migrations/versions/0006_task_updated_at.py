@@ -0,0 +1,22 @@
+"""tasks.updated_at, used to rank recently changed tasks in agent context
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("tasks", sa.Column("updated_at", sa.TIMESTAMP(), nullable=True))
+    op.execute("UPDATE tasks SET updated_at = created_at")
+
+
+def downgrade():
+    op.drop_column("tasks", "updated_at")
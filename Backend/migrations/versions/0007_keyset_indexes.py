@@ -0,0 +1,53 @@
+"""Composite indexes for keyset pagination of filtered task/comment listings
+
+GET /tasks and GET /comments filter on a foreign key (plus status) and page
+on `id`, so each filter gets an index ending in `id`. A deep page is then an
+index range scan that starts at the cursor instead of a sort of every
+matching row. The (project_id, status) and (assigned_to_id, status) indexes
+from 0002 are prefixes of the new ones and are dropped, as are the single
+column comment indexes.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns)
+NEW_INDEXES = [
+    ("ix_tasks_project_id_id", "tasks", ["project_id", "id"]),
+    ("ix_tasks_project_id_status_id", "tasks", ["project_id", "status", "id"]),
+    ("ix_tasks_assigned_to_id_id", "tasks", ["assigned_to_id", "id"]),
+    ("ix_tasks_assigned_to_id_status_id", "tasks", ["assigned_to_id", "status", "id"]),
+    ("ix_comments_task_id_id", "comments", ["task_id", "id"]),
+    ("ix_comments_user_id_id", "comments", ["user_id", "id"]),
+]
+
+# Superseded by the indexes above
+OLD_INDEXES = [
+    ("ix_tasks_project_id_status", "tasks", ["project_id", "status"]),
+    ("ix_tasks_assigned_to_id_status", "tasks", ["assigned_to_id", "status"]),
+    ("ix_comments_task_id", "comments", ["task_id"]),
+    ("ix_comments_user_id", "comments", ["user_id"]),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in NEW_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        for name, table, _ in OLD_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in OLD_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        for name, table, _ in reversed(NEW_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -1,15 +1,16 @@
 # models.py
-from sqlalchemy import Column, String, ForeignKey, Text, ARRAY, TIMESTAMP
+from sqlalchemy import Column, String, ForeignKey, Text, ARRAY, JSON, TIMESTAMP, Integer, BigInteger, LargeBinary, Index, text
 from sqlalchemy.orm import relationship
 from database import Base # Assuming database.py is in the same directory (e.g., app/database.py)
 from typing import Optional
+from datetime import datetime
 
 class User(Base):
     __tablename__ = "users"
 
     id = Column(String, primary_key=True, index=True)
     username = Column(String, unique=True, index=True, nullable=False)
-    clerkId = Column(String)
+    clerkId = Column(String, unique=True, index=True)
 
     # Relationships
     projects = relationship("Project", back_populates="owner")
@@ -24,8 +25,8 @@ class Project(Base):
     id = Column(String, primary_key=True, index=True)
     name = Column(String, index=True, nullable=False)
     description = Column(Text, nullable=True)
-    owner_id = Column(String, ForeignKey("users.id"), nullable=False)
-    collaborators = Column(ARRAY(String), nullable=True) # Store as comma-separated string of user IDs
+    owner_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    collaborators = Column(ARRAY(String).with_variant(JSON(), "sqlite"), nullable=True) # List of user IDs (JSON on SQLite)
 
     # Relationships
     owner = relationship("User", back_populates="projects")
@@ -44,6 +45,19 @@ class Task(Base):
     priority = Column(Text, nullable=True)
     assigned_to_id = Column(String, ForeignKey("users.id"), nullable=True) # Foreign key to User table
     status = Column(String, default="todo", nullable=False)  # todo, in_progress, done
+    updated_at = Column(TIMESTAMP, nullable=True, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # Task board and agent filters: project (+ status), assignee (+ status),
+        # ending in id for keyset pagination of GET /tasks
+        Index("ix_tasks_project_id_id", "project_id", "id"),
+        Index("ix_tasks_project_id_status_id", "project_id", "status", "id"),
+        Index("ix_tasks_assigned_to_id_id", "assigned_to_id", "id"),
+        Index("ix_tasks_assigned_to_id_status_id", "assigned_to_id", "status", "id"),
+        # Serves the overdue/deadline queries, which only look at open tasks
+        Index("ix_tasks_open_deadline", "deadline",
+              postgresql_where=text("status <> 'done'"), sqlite_where=text("status <> 'done'")),
+    )
 
     # Relationships
     project = relationship("Project", back_populates="tasks")
@@ -64,6 +78,65 @@ class Comment(Base):
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
     content = Column(Text, nullable=False)
 
+    __table_args__ = (
+        # GET /comments filters by task or author and pages on id
+        Index("ix_comments_task_id_id", "task_id", "id"),
+        Index("ix_comments_user_id_id", "user_id", "id"),
+    )
+
     # Relationships
     task = relationship("Task", back_populates="comments")
     user = relationship("User", back_populates="comments")
+
+
+class ProjectStats(Base):
+    """Per-project task counters, maintained in the same transaction as task writes (see project_stats.py)."""
+    __tablename__ = "project_stats"
+
+    project_id = Column(String, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    total_count = Column(Integer, nullable=False, default=0)
+    todo_count = Column(Integer, nullable=False, default=0)
+    in_progress_count = Column(Integer, nullable=False, default=0)
+    done_count = Column(Integer, nullable=False, default=0)
+    version = Column(BigInteger, nullable=False, default=0) # Incremented on every task change
+    last_activity_at = Column(TIMESTAMP, nullable=True)
+
+
+class ProjectAssigneeStats(Base):
+    """Open (not done) task count per assignee within a project."""
+    __tablename__ = "project_assignee_stats"
+
+    project_id = Column(String, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    assignee_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    open_count = Column(Integer, nullable=False, default=0)
+
+
+class AgentCheckpoint(Base):
+    """Serialized LangGraph checkpoint of an agent conversation thread (see checkpointer.py)."""
+    __tablename__ = "agent_checkpoints"
+
+    thread_id = Column(String, primary_key=True)
+    checkpoint_ns = Column(String, primary_key=True, default="")
+    checkpoint_id = Column(String, primary_key=True) # Time-ordered, so the latest sorts last
+    parent_checkpoint_id = Column(String, nullable=True)
+    type = Column(String, nullable=True)
+    checkpoint = Column(LargeBinary, nullable=False)
+    metadata_type = Column(String, nullable=True)
+    checkpoint_metadata = Column(LargeBinary, nullable=True)
+    created_at = Column(TIMESTAMP, nullable=False, index=True)
+
+
+class AgentCheckpointWrite(Base):
+    """Pending channel writes attached to an agent checkpoint."""
+    __tablename__ = "agent_checkpoint_writes"
+
+    thread_id = Column(String, primary_key=True)
+    checkpoint_ns = Column(String, primary_key=True, default="")
+    checkpoint_id = Column(String, primary_key=True)
+    task_id = Column(String, primary_key=True)
+    idx = Column(Integer, primary_key=True)
+    channel = Column(String, nullable=False)
+    type = Column(String, nullable=True)
+    value = Column(LargeBinary, nullable=True)
+    task_path = Column(String, nullable=False, default="")
+    created_at = Column(TIMESTAMP, nullable=False, index=True)
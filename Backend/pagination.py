@@ -0,0 +1,19 @@
+# pagination.py
+# Opaque keyset cursors for the list endpoints.
+import base64
+import json
+
+
+def encode_cursor(last_key: str) -> str:
+    """Encode the key of the last row on a page as an opaque, URL-safe cursor."""
+    raw = json.dumps({"k": last_key}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """Return the key encoded in a cursor. Raises ValueError for malformed cursors."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))["k"]
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
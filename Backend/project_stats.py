@@ -0,0 +1,160 @@
+# project_stats.py
+# Incremental maintenance of the project_stats / project_assignee_stats tables.
+#
+# Task writes through the ORM (API routes and agent tools) are picked up by
+# mapper events and applied with upserts on the flush connection, so the
+# counters commit or roll back together with the task change. ORM bulk
+# inserts skip mapper events and must call record_bulk_insert explicitly.
+# Bulk update() / delete() statements on tasks (and raw SQL) skip them too:
+# run rebuild() on the same connection afterwards, or the counters drift.
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import event, inspect, select, func, case, insert, delete
+from sqlalchemy.dialects import postgresql, sqlite
+
+import models
+import queries
+
+STATUS_COLUMNS = {
+    "todo": "todo_count",
+    "in_progress": "in_progress_count",
+    "done": "done_count",
+}
+
+# (project_id, status, assigned_to_id)
+Snapshot = Tuple[str, str, Optional[str]]
+
+
+def _insert_for(connection):
+    """Dialect-specific INSERT that supports ON CONFLICT DO UPDATE."""
+    if connection.dialect.name == "sqlite":
+        return sqlite.insert
+    return postgresql.insert
+
+
+def _upsert_increment(connection, model, keys: Dict, increments: Dict, values: Dict = None):
+    """INSERT keys+increments, or add the increments to the existing row."""
+    values = values or {}
+    table = model.__table__
+    stmt = _insert_for(connection)(table).values(**keys, **increments, **values)
+    set_ = {column: table.c[column] + stmt.excluded[column] for column in increments}
+    set_.update({column: stmt.excluded[column] for column in values})
+    connection.execute(stmt.on_conflict_do_update(index_elements=list(keys), set_=set_))
+
+
+def apply_deltas(connection, project_id: str, status_deltas: Dict[str, int],
+                 assignee_deltas: Dict[str, int], now: Optional[datetime] = None):
+    """Apply task count changes for one project and mark it as active (UTC, like the task timestamps)."""
+    increments = {"total_count": sum(status_deltas.values()), "version": 1}
+    for status, delta in status_deltas.items():
+        column = STATUS_COLUMNS.get(status)
+        if column:
+            increments[column] = increments.get(column, 0) + delta
+    _upsert_increment(
+        connection, models.ProjectStats, {"project_id": project_id}, increments,
+        {"last_activity_at": now or datetime.utcnow()},
+    )
+
+    for assignee_id, delta in assignee_deltas.items():
+        if delta:
+            _upsert_increment(
+                connection, models.ProjectAssigneeStats,
+                {"project_id": project_id, "assignee_id": assignee_id}, {"open_count": delta},
+            )
+
+
+def _apply_snapshots(connection, removed: Iterable[Snapshot], added: Iterable[Snapshot]):
+    by_project: Dict[str, Tuple[Counter, Counter]] = {}
+    for sign, snapshots in ((-1, removed), (1, added)):
+        for project_id, status, assignee_id in snapshots:
+            status_deltas, assignee_deltas = by_project.setdefault(project_id, (Counter(), Counter()))
+            status_deltas[status] += sign
+            if assignee_id and status != "done":
+                assignee_deltas[assignee_id] += sign
+    for project_id, (status_deltas, assignee_deltas) in by_project.items():
+        apply_deltas(connection, project_id, dict(status_deltas), dict(assignee_deltas))
+
+
+def record_bulk_insert(connection, rows: Iterable[Dict]):
+    """Count rows inserted with an ORM bulk INSERT (which bypasses mapper events)."""
+    _apply_snapshots(connection, [], [
+        (row["project_id"], row.get("status", "todo"), row.get("assigned_to_id")) for row in rows
+    ])
+
+
+def rebuild(connection):
+    """
+    Recompute every counter from the tasks table. Required after any bulk
+    update()/delete() of tasks or a load that bypassed the ORM. version
+    restarts at the project's task count.
+    """
+    task = models.Task.__table__
+    connection.execute(delete(models.ProjectAssigneeStats))
+    connection.execute(delete(models.ProjectStats))
+
+    status_counts = [func.sum(case((task.c.status == status, 1), else_=0)) for status in STATUS_COLUMNS]
+    connection.execute(insert(models.ProjectStats).from_select(
+        ["project_id", "total_count", *STATUS_COLUMNS.values(), "version", "last_activity_at"],
+        select(
+            task.c.project_id, func.count(), *status_counts, func.count(),
+            func.max(func.coalesce(task.c.updated_at, task.c.created_at)),
+        ).group_by(task.c.project_id),
+    ))
+    connection.execute(insert(models.ProjectAssigneeStats).from_select(
+        ["project_id", "assignee_id", "open_count"],
+        select(task.c.project_id, task.c.assigned_to_id, func.count())
+        .where(task.c.assigned_to_id.isnot(None), queries.open_task_filter())
+        .group_by(task.c.project_id, task.c.assigned_to_id),
+    ))
+
+
+def _previous(target, attr: str):
+    """Value of an attribute before the pending flush."""
+    history = inspect(target).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(target, attr)
+
+
+def _current_snapshot(target) -> Snapshot:
+    return (target.project_id, target.status, target.assigned_to_id)
+
+
+def _previous_snapshot(target) -> Snapshot:
+    return (_previous(target, "project_id"), _previous(target, "status"), _previous(target, "assigned_to_id"))
+
+
+@event.listens_for(models.Task, "after_insert")
+def _task_inserted(mapper, connection, target):
+    _apply_snapshots(connection, [], [_current_snapshot(target)])
+
+
+@event.listens_for(models.Task, "after_update")
+def _task_updated(mapper, connection, target):
+    before, after = _previous_snapshot(target), _current_snapshot(target)
+    if before == after:
+        # Only non-counted fields changed; still record the activity
+        apply_deltas(connection, after[0], {}, {})
+    else:
+        _apply_snapshots(connection, [before], [after])
+
+
+@event.listens_for(models.Task, "after_delete")
+def _task_deleted(mapper, connection, target):
+    _apply_snapshots(connection, [_previous_snapshot(target)], [])
+
+
+def overdue_count_query(project_id: str, now: datetime):
+    """
+    Overdue tasks depend on the clock, so they are counted at read time
+    from the open-task indexes rather than stored.
+    """
+    return select(func.count()).select_from(models.Task).where(
+        models.Task.project_id == project_id,
+        models.Task.deadline < now,
+        queries.open_task_filter(),
+    )
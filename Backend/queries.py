@@ -0,0 +1,149 @@
+# queries.py
+# Reusable statements shared by the API routes and the agent tools.
+# Each function returns a statement, so it can be executed by both the sync
+# Session (agents) and the AsyncSession (CRUD API).
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select, insert, func, literal, DateTime, Integer
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+import models
+
+
+class days_between(FunctionElement):
+    """Whole days from `start` to `end`: days_between(end, start)."""
+    type = Integer()
+    name = "days_between"
+    inherit_cache = True
+
+
+@compiles(days_between)
+def _days_between(element, compiler, **kw):
+    end, start = element.clauses
+    return f"EXTRACT(day FROM {compiler.process(end, **kw)} - {compiler.process(start, **kw)})"
+
+
+@compiles(days_between, "sqlite")
+def _days_between_sqlite(element, compiler, **kw):
+    # No interval type on SQLite; julianday differences are fractional days
+    end, start = element.clauses
+    return f"CAST(julianday({compiler.process(end, **kw)}) - julianday({compiler.process(start, **kw)}) AS INTEGER)"
+
+
+def open_task_filter():
+    """
+    `status <> 'done'` with the value rendered inline, so the planner can match
+    it against the partial ix_tasks_open_deadline index even with prepared statements.
+    """
+    return models.Task.status != literal("done", literal_execute=True)
+
+
+def user_project_summaries(user_id: str):
+    """Projects owned by a user with their task and completed-task counts from project_stats."""
+    return (
+        select(
+            models.Project.id,
+            models.Project.name,
+            models.Project.description,
+            func.coalesce(models.ProjectStats.total_count, 0).label("task_count"),
+            func.coalesce(models.ProjectStats.done_count, 0).label("completed_tasks"),
+        )
+        .outerjoin(models.ProjectStats, models.ProjectStats.project_id == models.Project.id)
+        .where(models.Project.owner_id == user_id)
+    )
+
+
+def project_task_rows(project_id: str, status: Optional[str] = None):
+    """Tasks of a project joined with the assignee's username, optionally filtered by status."""
+    query = (
+        select(
+            models.Task.id,
+            models.Task.title,
+            models.Task.description,
+            models.Task.status,
+            models.Task.priority,
+            models.Task.deadline,
+            models.Task.created_at,
+            models.Task.updated_at,
+            models.User.username.label("assignee_name"),
+        )
+        .outerjoin(models.User, models.User.id == models.Task.assigned_to_id)
+        .where(models.Task.project_id == project_id)
+    )
+    if status:
+        query = query.where(models.Task.status == status)
+    return query.order_by(models.Task.deadline, models.Task.id)
+
+
+def overdue_tasks(user_id: str, now: datetime, limit: int = 50, offset: int = 0,
+                  project_id: Optional[str] = None):
+    """
+    Open tasks past their deadline, most overdue first: in projects owned by a
+    user, or in one project when `project_id` is given (the caller checks that
+    the user is its owner or a collaborator). Filtering, days_overdue and
+    ordering all happen in the database.
+    """
+    days_overdue = days_between(literal(now, DateTime), models.Task.deadline)
+    query = (
+        select(
+            models.Task.id,
+            models.Task.title,
+            models.Task.project_id,
+            models.Project.name.label("project"),
+            models.Task.deadline,
+            days_overdue.label("days_overdue"),
+            models.User.username.label("assignee_name"),
+        )
+        .join(models.Project, models.Project.id == models.Task.project_id)
+        .outerjoin(models.User, models.User.id == models.Task.assigned_to_id)
+        .where(models.Task.deadline < now, open_task_filter())
+    )
+    if project_id:
+        query = query.where(models.Task.project_id == project_id)
+    else:
+        query = query.where(models.Project.owner_id == user_id)
+    return query.order_by(models.Task.deadline, models.Task.id).limit(limit).offset(offset)
+
+
+def upcoming_tasks(project_id: str, now: datetime, until: datetime, limit: int = 20):
+    """Open tasks of a project due between now and `until`, soonest first."""
+    return (
+        select(
+            models.Task.id,
+            models.Task.title,
+            models.Task.deadline,
+            models.Task.priority,
+            models.User.username.label("assignee_name"),
+        )
+        .outerjoin(models.User, models.User.id == models.Task.assigned_to_id)
+        .where(
+            models.Task.project_id == project_id,
+            models.Task.deadline >= now,
+            models.Task.deadline < until,
+            open_task_filter(),
+        )
+        .order_by(models.Task.deadline, models.Task.id)
+        .limit(limit)
+    )
+
+
+def busiest_assignees(project_id: str, limit: int = 3):
+    """Assignees with the most open tasks in a project, from project_assignee_stats."""
+    return (
+        select(models.User.username, models.ProjectAssigneeStats.open_count)
+        .join(models.User, models.User.id == models.ProjectAssigneeStats.assignee_id)
+        .where(
+            models.ProjectAssigneeStats.project_id == project_id,
+            models.ProjectAssigneeStats.open_count > 0,
+        )
+        .order_by(models.ProjectAssigneeStats.open_count.desc())
+        .limit(limit)
+    )
+
+
+def insert_tasks():
+    """
+    ORM bulk INSERT ... RETURNING for tasks. Execute it with a list of row dicts
+    (keyed by model attribute) to insert them all in one batched statement.
+    """
+    return insert(models.Task).returning(models.Task)
@@ -0,0 +1,114 @@
+# query_counter.py
+# Per-request SQL statement counts and N+1 detection.
+#
+# app.py tracks every request (and jobs.py every background job) in a
+# ContextVar, which is inherited by worker threads and tasks started from it,
+# so statements from sync agent tools and async routes both land in the
+# request's tally. Counts and DB time go out as X-DB-Queries / X-DB-Time-ms.
+#
+# DB_QUERY_CHECK=log or raise (for dev/test) additionally flags requests that
+# exceed DB_QUERY_BUDGET statements, or that repeat one statement shape more
+# than DB_QUERY_REPEAT_LIMIT times (the usual sign of a lazy-load N+1).
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from metrics import fingerprint
+
+CHECK_MODE = os.getenv("DB_QUERY_CHECK", "off").lower() # off, log, raise
+QUERY_BUDGET = int(os.getenv("DB_QUERY_BUDGET", "50"))
+REPEAT_LIMIT = int(os.getenv("DB_QUERY_REPEAT_LIMIT", "5"))
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised in DB_QUERY_CHECK=raise mode when a request looks like an N+1."""
+
+
+class RequestQueries:
+    """Statements issued on behalf of one request; also counted in the enclosing tally, if any."""
+
+    def __init__(self, parent: Optional["RequestQueries"] = None):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+        self.parent = parent
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, elapsed: float):
+        with self._lock:
+            self.count += 1
+            self.seconds += elapsed
+            self.shapes[fingerprint(statement)] += 1
+        if self.parent is not None:
+            self.parent.record(statement, elapsed)
+
+    def repeated(self, limit: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed more than `limit` times, most frequent first."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > limit]
+
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+@contextmanager
+def track(nested: bool = True) -> Iterator[RequestQueries]:
+    """
+    Count the statements issued inside the block (and threads/tasks it starts).
+    A nested block also adds its statements to the enclosing one, e.g. a
+    request inside a benchmark's tally; nested=False starts an independent one.
+    """
+    stats = RequestQueries(_current.get() if nested else None)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def check(stats: RequestQueries, label: str):
+    """Log or raise for a request over the query budget or with repeated statement shapes."""
+    if CHECK_MODE not in ("log", "raise"):
+        return
+    problems = []
+    if QUERY_BUDGET and stats.count > QUERY_BUDGET:
+        problems.append(f"{stats.count} statements (budget {QUERY_BUDGET})")
+    problems.extend(f"{count}x {shape}" for shape, count in stats.repeated(REPEAT_LIMIT))
+    if not problems:
+        return
+    message = f"Possible N+1 in {label}: " + "; ".join(problems)
+    if CHECK_MODE == "raise":
+        raise QueryBudgetExceeded(message)
+    print(message)
+
+
+def instrument_engine(engine):
+    """Feed the current request's tally; pass async_engine.sync_engine for async engines."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault("query_counter_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        started = conn.info.get("query_counter_started")
+        if stats is not None and started:
+            stats.record(statement, time.perf_counter() - started.pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        connection = context.connection
+        if connection is not None and connection.info.get("query_counter_started"):
+            connection.info["query_counter_started"].pop()
+
+
+def instrument_database(database_module):
+    instrument_engine(database_module.engine)
+    instrument_engine(database_module.async_engine.sync_engine)
@@ -1,6 +1,6 @@
 # schemas.py
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict
 import uuid
 import os
 from datetime import datetime
@@ -36,8 +36,13 @@ class Project(ProjectBase): # Response model
     class Config:
         from_attributes = True
 
-class User(UserBase): # Response model
+class UserSummary(UserBase): # Slim response model, without the nested projects
     id: str
+
+    class Config:
+        from_attributes = True
+
+class User(UserSummary): # Response model
     projects: List[Project] = []
 
     class Config:
@@ -57,6 +62,15 @@ class TaskCreate(TaskBase):
     created_at: Optional[datetime] = None  # Use datetime type
     deadline: Optional[datetime] = None
 
+class TaskBulkItem(TaskBase):
+    assigned_to: Optional[str] = None
+    created_at: Optional[datetime] = None
+    deadline: Optional[datetime] = None
+
+class TaskBulkCreate(BaseModel):
+    project_id: str # All tasks in a bulk request belong to this project
+    tasks: List[TaskBulkItem] = Field(..., min_length=1, max_length=1000)
+
 class TaskUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
@@ -72,6 +86,7 @@ class Task(TaskBase): # Response model
     created_at: datetime
     priority: Optional[str] = None
     deadline: Optional[datetime] = None  # Changed this line
+    updated_at: Optional[datetime] = None
     # To include assignee or project objects, you could add:
     # assignee: Optional[User] = None
     # project: Project
@@ -79,6 +94,15 @@ class Task(TaskBase): # Response model
     class Config:
         from_attributes = True
 
+class OverdueTask(BaseModel): # Response model for GET /tasks/overdue
+    id: str
+    title: str
+    project_id: str
+    project: str
+    deadline: datetime
+    days_overdue: int
+    assigned_to: Optional[str] = None # Assignee username
+
 
 # --- Comment Schemas ---
 class CommentBase(BaseModel):
@@ -102,6 +126,37 @@ class Comment(CommentBase): # Response model
 # AI Endpoints Schemas (if needed, though AI functions often use simple types directly)
 # For example, if you had complex AI request/response objects
 
+# --- Project Stats Schemas ---
+class ProjectStats(BaseModel): # Response model for GET /projects/{id}/stats
+    project_id: str
+    total_count: int = 0
+    todo_count: int = 0
+    in_progress_count: int = 0
+    done_count: int = 0
+    overdue_count: int = 0
+    open_by_assignee: Dict[str, int] = {} # assignee user id -> open task count
+    last_activity_at: Optional[datetime] = None
+    version: int = 0
+
+# --- AI Job Schemas ---
+class AIJobCreate(BaseModel):
+    kind: str = Field(..., pattern="^(project_insights|workflow_automation|team_insights|smart_task_creation)$")
+    user_id: str
+    project_id: Optional[str] = None # Required for every kind except team_insights
+    automation_type: Optional[str] = None # workflow_automation only
+    description: Optional[str] = None # smart_task_creation only
+    auto_create: bool = False # smart_task_creation only
+
+class AIJob(BaseModel): # Response model for /ai/jobs
+    id: str
+    kind: Optional[str] = None
+    status: str # queued, running, succeeded, failed
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
 # New schema for adding collaborators
 class ProjectAddCollaborators(BaseModel):
     project_id: str
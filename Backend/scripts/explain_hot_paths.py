@@ -0,0 +1,73 @@
+# scripts/explain_hot_paths.py
+"""
+Print EXPLAIN (ANALYZE) plans for the hot filter paths against DATABASE_URL,
+to check that they use the indexes from migrations 0002 and 0007 rather than
+Seq Scans. On SQLite this prints EXPLAIN QUERY PLAN (--analyze is ignored).
+Recorded plans: docs/hot_path_plans.md.
+
+Usage (from the Backend directory):
+    python -m scripts.explain_hot_paths [--analyze]
+"""
+import argparse
+from datetime import datetime
+
+from sqlalchemy import select
+
+import database
+import models
+import project_stats
+import queries
+
+
+def _sample(conn, column):
+    """Pick an existing value to filter on so the plans reflect real selectivity."""
+    return conn.execute(select(column).where(column.isnot(None)).limit(1)).scalar()
+
+
+def hot_path_statements(conn):
+    project_id = _sample(conn, models.Task.project_id)
+    assignee_id = _sample(conn, models.Task.assigned_to_id)
+    task_id = _sample(conn, models.Comment.task_id)
+    user_id = _sample(conn, models.Project.owner_id)
+
+    return {
+        "list_tasks(project_id, status)": select(models.Task).where(
+            models.Task.project_id == project_id, models.Task.status == "todo"
+        ).order_by(models.Task.id).limit(100),
+        "list_tasks(assigned_to_id, status)": select(models.Task).where(
+            models.Task.assigned_to_id == assignee_id, models.Task.status == "in_progress"
+        ).order_by(models.Task.id).limit(100),
+        "list_comments(task_id)": select(models.Comment).where(models.Comment.task_id == task_id).order_by(models.Comment.id).limit(100),
+        "list_comments(user_id)": select(models.Comment).where(models.Comment.user_id == user_id).order_by(models.Comment.id).limit(100),
+        "get_user_projects": queries.user_project_summaries(user_id),
+        "get_project_tasks": queries.project_task_rows(project_id, "todo"),
+        "overdue_tasks": queries.overdue_tasks(user_id, datetime.now()),
+        "project overdue count": project_stats.overdue_count_query(project_id, datetime.now()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--analyze", action="store_true", help="run EXPLAIN ANALYZE (executes the queries)")
+    args = parser.parse_args()
+
+    with database.engine.connect() as conn:
+        if conn.dialect.name == "sqlite":
+            explain = "EXPLAIN QUERY PLAN "
+        else:
+            explain = "EXPLAIN (ANALYZE, BUFFERS) " if args.analyze else "EXPLAIN "
+        for name, statement in hot_path_statements(conn).items():
+            compiled = statement.compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+            params = compiled.params
+            if compiled.positional:
+                params = tuple(params[key] for key in compiled.positiontup)
+            plan = conn.exec_driver_sql(explain + str(compiled), params).all()
+            # PostgreSQL returns one text column; SQLite (id, parent, notused, detail)
+            plan = [row[-1] for row in plan]
+            print(f"--- {name}")
+            print("\n".join(plan))
+            print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# tests/conftest.py
+"""
+Test setup: a fresh SQLite database per run, the in-memory LLM cache and job
+backend, and the AI stack left unloaded until a test asks for it.
+"""
+import os
+import tempfile
+
+TEST_DIR = tempfile.mkdtemp(prefix="planora-tests-")
+
+# Must be set before database.py and llm_cache.py are imported
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.pop("CHECKPOINT_DATABASE_URL", None)
+os.environ["LLM_CACHE_BACKEND"] = "memory"
+os.environ["JOB_BACKEND"] = "memory"
+os.environ["AI_WARMUP"] = "lazy"
+os.environ.setdefault("GOOGLE_API_KEY", "test")
+
+import pytest
+from fastapi.testclient import TestClient
+
+import database
+from app import app
+
+
+@pytest.fixture(scope="session")
+def engine():
+    database.Base.metadata.create_all(bind=database.engine)
+    return database.engine
+
+
+@pytest.fixture
+def db(engine):
+    """Empty tables before each test; yields a sync session."""
+    with engine.begin() as connection:
+        for table in reversed(database.Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+    with database.SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def client(db):
+    with TestClient(app) as client:
+        yield client
@@ -0,0 +1,73 @@
+# tests/test_checkpointer.py
+"""SQLCheckpointSaver round trip, compaction and metadata filtering."""
+import asyncio
+
+from langgraph.checkpoint.base import empty_checkpoint
+from sqlalchemy import func, select
+
+import models
+from checkpointer import SQLCheckpointSaver
+
+THREAD = {"configurable": {"thread_id": "user_project", "checkpoint_ns": ""}}
+
+
+def _put(saver, config, step, **metadata):
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {"step": step}
+    return saver.put(config, checkpoint, {"step": step, **metadata}, {})
+
+
+def test_put_and_read_back(db, engine):
+    saver = SQLCheckpointSaver(engine)
+    first = _put(saver, THREAD, 0)
+    saver.put_writes(first, [("messages", "hello"), ("route", "general")], task_id="task-1")
+    second = _put(saver, first, 1)
+
+    latest = saver.get_tuple(THREAD)
+    assert latest.config == second
+    assert latest.parent_config == first
+    assert latest.checkpoint["channel_values"] == {"step": 1}
+    assert latest.metadata == {"step": 1}
+
+    earlier = saver.get_tuple(first)
+    assert earlier.checkpoint["channel_values"] == {"step": 0}
+    assert sorted(earlier.pending_writes) == [("task-1", "messages", "hello"), ("task-1", "route", "general")]
+
+    assert saver.get_tuple({"configurable": {"thread_id": "other", "checkpoint_ns": ""}}) is None
+
+
+def test_async_api_round_trip(db, engine):
+    saver = SQLCheckpointSaver(engine)
+
+    async def run():
+        config = await saver.aput(THREAD, empty_checkpoint(), {"step": 0}, {})
+        return config, await saver.aget_tuple(THREAD), [item async for item in saver.alist(THREAD)]
+
+    config, latest, listed = asyncio.run(run())
+    assert latest.config == config
+    assert [item.config for item in listed] == [config]
+
+
+def test_compaction_keeps_newest_checkpoints(db, engine):
+    saver = SQLCheckpointSaver(engine, max_checkpoints=3)
+    configs = [THREAD]
+    for step in range(6):
+        configs.append(_put(saver, configs[-1], step))
+        saver.put_writes(configs[-1], [("messages", step)], task_id=f"task-{step}")
+
+    kept = list(saver.list(THREAD))
+    assert [item.metadata["step"] for item in kept] == [5, 4, 3]
+    assert saver.get_tuple(configs[1]) is None
+
+    # Writes of compacted checkpoints go with them
+    with engine.connect() as connection:
+        writes = connection.scalar(select(func.count()).select_from(models.AgentCheckpointWrite))
+    assert writes == 3
+
+
+def test_db_session_is_not_persisted(db, engine):
+    saver = SQLCheckpointSaver(engine)
+    _put(saver, THREAD, 0, db=db, user_id="u1")
+
+    assert saver.get_tuple(THREAD).metadata == {"step": 0, "user_id": "u1"}
+    assert list(saver.list(THREAD, filter={"user_id": "u1"}))
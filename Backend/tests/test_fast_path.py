@@ -0,0 +1,171 @@
+# tests/test_fast_path.py
+"""Which assistant queries the fast path answers, and what it answers."""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+import fast_path
+import models
+
+# (query, request_type from _classify_request, expected intent)
+INTENT_CASES = [
+    ("Show overdue tasks", "deadline_management", "overdue"),
+    ("What is late?", "deadline_management", "overdue"),
+    ("Which tasks missed deadlines", "deadline_management", "overdue"),
+    ("Overdue status", "status_update", "overdue"),
+    ("Project summary", "project_overview", "summary"),
+    ("Give me a status report", "status_update", "summary"),
+    ("Progress report please", "status_update", "summary"),
+    # Open-ended wording needs the LLM
+    ("Why are these tasks overdue?", "deadline_management", None),
+    ("How should we handle overdue work", "deadline_management", None),
+    ("Suggest a plan for overdue tasks", "deadline_management", None),
+    ("Create a summary task", "task_creation", None),
+    # More than MAX_QUERY_WORDS words
+    ("Show me every single overdue task across all of my projects right now please",
+     "deadline_management", None),
+    # Intent words under a request type they don't belong to
+    ("Overdue tasks", "general_assistance", None),
+    ("Project summary", "deadline_management", None),
+    ("What is the team working on", "general_assistance", None),
+]
+
+
+@pytest.mark.parametrize("query, request_type, intent", INTENT_CASES)
+def test_match_intent(query, request_type, intent):
+    assert fast_path.match_intent(query, request_type) == intent
+
+
+def test_word_cap_is_inclusive():
+    query = " ".join(["overdue"] * fast_path.MAX_QUERY_WORDS)
+    assert fast_path.match_intent(query, "deadline_management") == "overdue"
+    assert fast_path.match_intent(query + " tasks", "deadline_management") is None
+
+
+@pytest.fixture
+def project(db):
+    owner = models.User(id=str(uuid.uuid4()), username="owner", clerkId="clerk_owner")
+    helper = models.User(id=str(uuid.uuid4()), username="helper", clerkId="clerk_helper")
+    project = models.Project(id=str(uuid.uuid4()), name="Apollo", owner_id=owner.id, collaborators=[])
+    db.add_all([owner, helper, project])
+    db.commit()
+    return project
+
+
+def _add_tasks(db, project, count, days_from_now, status="todo", assignee_id=None):
+    now = datetime.now()
+    for i in range(count):
+        db.add(models.Task(
+            id=str(uuid.uuid4()), project_id=project.id, title=f"Task {days_from_now} {i}",
+            created_at=now - timedelta(days=30), deadline=now + timedelta(days=days_from_now, hours=-i),
+            status=status, assigned_to_id=assignee_id,
+        ))
+    db.commit()
+
+
+# (query, request_type, needs project_id, answered)
+ANSWER_CASES = [
+    ("Show overdue tasks", "deadline_management", False, True),
+    ("Show overdue tasks", "deadline_management", True, True),
+    ("Project summary", "project_overview", True, True),
+    ("Project summary", "project_overview", False, False),
+    ("Why is everything overdue?", "deadline_management", True, False),
+    ("Tell me about the project", "general_assistance", True, False),
+]
+
+
+@pytest.mark.parametrize("query, request_type, with_project, answered", ANSWER_CASES)
+def test_try_answer_hits_or_falls_through(db, project, query, request_type, with_project, answered):
+    _add_tasks(db, project, 2, -3)
+    project_id = project.id if with_project else None
+    result = fast_path.try_answer(db, project.owner_id, query, project_id, request_type)
+    assert (result is not None) == answered
+    if answered:
+        assert result["context"]["fast_path"] is True
+
+
+def test_disabled_fast_path_always_falls_through(db, project, monkeypatch):
+    monkeypatch.setattr(fast_path, "ENABLED", False)
+    assert fast_path.try_answer(db, project.owner_id, "Show overdue tasks", project.id, "deadline_management") is None
+
+
+def test_overdue_answer_labels_ordering(db, project):
+    _add_tasks(db, project, 3, -2)
+    _add_tasks(db, project, 2, -2, status="done")
+    _add_tasks(db, project, 2, 5)
+
+    result = fast_path.answer_overdue(db, project.owner_id, project.id)
+    assert result["response"].startswith("3 overdue tasks, most overdue first:")
+    assert len(result["data"]["overdue_tasks"]) == 3
+    assert result["data"]["more_overdue"] is False
+    days = [task["days_overdue"] for task in result["data"]["overdue_tasks"]]
+    assert days == sorted(days, reverse=True)
+
+
+def test_overdue_answer_says_when_more_exist(db, project):
+    limit = fast_path.OVERDUE_LIST_LIMIT
+    _add_tasks(db, project, limit, -2)
+    exact = fast_path.answer_overdue(db, project.owner_id, project.id)
+    assert exact["response"].startswith(f"{limit} overdue tasks, most overdue first:")
+    assert exact["data"]["more_overdue"] is False
+
+    _add_tasks(db, project, 1, -1)
+    more = fast_path.answer_overdue(db, project.owner_id, project.id)
+    assert more["response"].startswith(f"More than {limit} overdue tasks; the {limit} most overdue:")
+    assert len(more["data"]["overdue_tasks"]) == limit
+    assert more["data"]["more_overdue"] is True
+
+
+def test_nothing_overdue(db, project):
+    _add_tasks(db, project, 2, 4)
+    assert fast_path.answer_overdue(db, project.owner_id, project.id)["response"] == "Nothing is overdue right now."
+
+
+def test_summary_from_counters(db, project):
+    helper = db.query(models.User).filter_by(username="helper").one()
+    _add_tasks(db, project, 2, -1, assignee_id=helper.id)
+    _add_tasks(db, project, 1, 3, status="in_progress")
+    _add_tasks(db, project, 1, 3, status="done")
+
+    result = fast_path.answer_summary(db, project.owner_id, project.id)
+    assert result["response"] == (
+        "Apollo: 4 tasks (2 to do, 1 in progress, 1 done), 25% complete. 2 overdue. Most open work: helper (2)."
+    )
+    assert fast_path.answer_summary(db, project.owner_id, "missing") is None
+
+
+def test_deadline_alert_sections(db, project):
+    _add_tasks(db, project, 1, -2)
+    _add_tasks(db, project, 1, 2)
+    _add_tasks(db, project, 1, fast_path.UPCOMING_DAYS + 3)
+
+    text = fast_path.answer_deadline_alert(db, project.owner_id, project.id)["response"]
+    assert text.startswith("Overdue (1):")
+    assert f"Due in the next {fast_path.UPCOMING_DAYS} days (1):" in text
+
+
+def test_collaborator_sees_project_overdue_tasks(db, project):
+    helper = db.query(models.User).filter_by(username="helper").one()
+    project.collaborators = [helper.id]
+    db.commit()
+    _add_tasks(db, project, 1, -2)
+    _add_tasks(db, project, 1, 2)
+
+    for user_id in (project.owner_id, helper.id):
+        result = fast_path.try_answer(db, user_id, "Show overdue tasks", project.id, "deadline_management")
+        assert result["response"].startswith("1 overdue task, most overdue first:")
+        alert = fast_path.answer_deadline_alert(db, user_id, project.id)["response"]
+        assert alert.startswith("Overdue (1):")
+        assert f"Due in the next {fast_path.UPCOMING_DAYS} days (1):" in alert
+
+
+def test_outsider_falls_through_to_the_llm(db, project):
+    outsider = models.User(id=str(uuid.uuid4()), username="outsider", clerkId="clerk_outsider")
+    db.add(outsider)
+    db.commit()
+    _add_tasks(db, project, 1, -2)
+
+    assert fast_path.try_answer(db, outsider.id, "Show overdue tasks", project.id, "deadline_management") is None
+    assert fast_path.try_answer(db, outsider.id, "Project summary", project.id, "project_overview") is None
+    assert fast_path.answer_deadline_alert(db, outsider.id, project.id) is None
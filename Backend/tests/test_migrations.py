@@ -0,0 +1,34 @@
+# tests/test_migrations.py
+"""The Alembic chain runs on SQLite and ends at the schema declared in models.py."""
+import os
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, text
+
+import database
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_upgrade_matches_models_and_downgrades(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    # migrations/env.py connects to database.DATABASE_URL
+    monkeypatch.setattr(database, "DATABASE_URL", url)
+    config = Config()
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+
+    command.upgrade(config, "head")
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        assert compare_metadata(MigrationContext.configure(connection), database.Base.metadata) == []
+        partial = connection.scalar(text("SELECT sql FROM sqlite_master WHERE name = 'ix_tasks_open_deadline'"))
+        assert "WHERE status <> 'done'" in partial
+
+    command.downgrade(config, "base")
+    with engine.connect() as connection:
+        tables = connection.scalars(text("SELECT name FROM sqlite_master WHERE type = 'table'")).all()
+    assert tables == ["alembic_version"]
+    engine.dispose()
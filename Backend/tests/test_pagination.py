@@ -0,0 +1,41 @@
+# tests/test_pagination.py
+"""Keyset and offset pagination of the list endpoints."""
+import pytest
+
+LIST_PATHS = ["/users", "/users/summary", "/projects", "/tasks", "/comments"]
+
+
+def _users(client, count):
+    for i in range(count):
+        response = client.post("/users", json={"username": f"user{i:02d}", "clerkId": f"clerk_{i:02d}"})
+        assert response.status_code == 201, response.text
+
+
+@pytest.mark.parametrize("path", LIST_PATHS)
+@pytest.mark.parametrize("params", [{"limit": 0}, {"limit": -1}, {"limit": 100000}, {"skip": -1}])
+def test_out_of_range_paging_is_rejected(client, path, params):
+    _users(client, 1)
+    assert client.get(path, params=params).status_code == 422
+
+
+def test_cursor_walks_every_row_once(client):
+    _users(client, 5)
+    seen, cursor = [], ""
+    while cursor is not None:
+        response = client.get("/users/summary", params={"limit": 2, "cursor": cursor})
+        assert response.status_code == 200, response.text
+        seen.extend(user["id"] for user in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+    assert len(seen) == len(set(seen)) == 5
+    assert seen == sorted(seen)
+
+
+def test_last_full_page_has_no_cursor(client):
+    _users(client, 2)
+    response = client.get("/users/summary", params={"limit": 2, "cursor": ""})
+    assert len(response.json()) == 2
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_bad_cursor(client):
+    assert client.get("/users/summary", params={"cursor": "not-a-cursor"}).status_code == 400
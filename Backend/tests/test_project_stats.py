@@ -0,0 +1,122 @@
+# tests/test_project_stats.py
+"""The incrementally maintained counters must match a rebuild from the tasks table."""
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+import models
+import project_stats
+
+
+def _counters(engine):
+    """Counter rows keyed by project (and assignee); rows that dropped to zero are left out."""
+    with engine.connect() as connection:
+        stats = {
+            row.project_id: (row.total_count, row.todo_count, row.in_progress_count, row.done_count)
+            for row in connection.execute(select(models.ProjectStats))
+            if row.total_count
+        }
+        assignees = {
+            (row.project_id, row.assignee_id): row.open_count
+            for row in connection.execute(select(models.ProjectAssigneeStats))
+            if row.open_count
+        }
+    return stats, assignees
+
+
+def _rebuilt(engine):
+    with engine.begin() as connection:
+        project_stats.rebuild(connection)
+    return _counters(engine)
+
+
+def _created(client, path, body):
+    response = client.post(path, json=body)
+    assert response.status_code in (200, 201), response.text
+    return response.json()
+
+
+def _user(client, name):
+    return _created(client, "/users", {"username": name, "clerkId": f"clerk_{name}"})
+
+
+def _project(client, name, owner):
+    return _created(client, "/projects", {"name": name, "owner_id": owner["id"], "collaborators": []})
+
+
+def _deadline():
+    return (datetime.now() + timedelta(days=3)).isoformat()
+
+
+def _task(client, project_id, **fields):
+    return _created(client, "/tasks", {"project_id": project_id, "title": "Task", "deadline": _deadline(), **fields})
+
+
+def test_counters_match_rebuild_after_task_writes(client, engine):
+    alice, bob = _user(client, "alice"), _user(client, "bob")
+    project, other = _project(client, "Apollo", alice), _project(client, "Gemini", bob)
+
+    # ORM creates
+    first = _task(client, project["id"], assigned_to=alice["id"])
+    second = _task(client, project["id"], assigned_to=bob["id"], status="in_progress")
+    third = _task(client, other["id"], assigned_to=bob["id"])
+
+    # Status change, reassignment, both at once, and delete
+    assert client.put(f"/tasks/{first['id']}", json={"status": "done"}).status_code == 200
+    assert client.put(f"/tasks/{second['id']}", json={"assigned_to": alice["id"]}).status_code == 200
+    assert client.put(f"/tasks/{third['id']}", json={"status": "in_progress", "assigned_to": alice["id"]}).status_code == 200
+    assert client.delete(f"/tasks/{second['id']}").status_code in (200, 204)
+
+    # Bulk insert, which bypasses the mapper events
+    _created(client, "/tasks/bulk", {"project_id": project["id"], "tasks": [
+        {"title": "Bulk todo", "deadline": _deadline(), "assigned_to": bob["id"]},
+        {"title": "Bulk done", "deadline": _deadline(), "status": "done", "assigned_to": bob["id"]},
+        {"title": "Bulk unassigned", "deadline": _deadline(), "status": "in_progress"},
+    ]})
+
+    incremental = _counters(engine)
+    assert incremental == _rebuilt(engine)
+    stats, assignees = incremental
+    assert stats[project["id"]] == (4, 1, 1, 2)
+    assert stats[other["id"]] == (1, 0, 1, 0)
+    assert assignees == {(project["id"], bob["id"]): 1, (other["id"], alice["id"]): 1}
+
+
+def test_rolled_back_write_leaves_counters_unchanged(client, db, engine):
+    user = _user(client, "carol")
+    project = _project(client, "Mercury", user)
+    task = _task(client, project["id"], assigned_to=user["id"])
+    before = _counters(engine)
+
+    db.get(models.Task, task["id"]).status = "done"
+    db.flush()
+    db.rollback()
+
+    assert _counters(engine) == before == _rebuilt(engine)
+
+
+def _last_activity(engine, project_id):
+    with engine.connect() as connection:
+        return connection.scalar(
+            select(models.ProjectStats.last_activity_at).where(models.ProjectStats.project_id == project_id)
+        )
+
+
+def test_last_activity_is_utc_like_rebuild(client, engine, monkeypatch):
+    # A host far from UTC makes local and UTC timestamps differ by hours
+    monkeypatch.setenv("TZ", "Asia/Kolkata")
+    time.tzset()
+    try:
+        user = _user(client, "dave")
+        project = _project(client, "Venus", user)
+        task = _task(client, project["id"])
+        assert client.put(f"/tasks/{task['id']}", json={"status": "in_progress"}).status_code == 200
+
+        incremental = _last_activity(engine, project["id"])
+        _rebuilt(engine)
+        rebuilt = _last_activity(engine, project["id"])
+        assert abs(incremental - rebuilt) < timedelta(minutes=1)
+    finally:
+        monkeypatch.undo()
+        time.tzset()
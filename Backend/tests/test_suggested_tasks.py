@@ -0,0 +1,46 @@
+# tests/test_suggested_tasks.py
+"""Creating AI-suggested tasks from model output that may be malformed."""
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+
+import agents
+import models
+
+
+@pytest.fixture
+def project(db):
+    owner = models.User(id=str(uuid.uuid4()), username="owner", clerkId="clerk_owner")
+    project = models.Project(id=str(uuid.uuid4()), name="Apollo", owner_id=owner.id, collaborators=[])
+    db.add_all([owner, project])
+    db.commit()
+    return project
+
+
+@pytest.mark.parametrize("estimated_days, days", [
+    (3, 3), ("5", 5), (2.7, 2), (None, 7), ("soon", 7), ([3], 7), (float("nan"), 7),
+    (0, 1), (-4, 1), (10 ** 12, agents.MAX_SUGGESTED_DAYS), (float("inf"), agents.MAX_SUGGESTED_DAYS),
+])
+def test_estimated_days_is_coerced(estimated_days, days):
+    assert agents._suggested_deadline_days(estimated_days) == days
+
+
+def test_creates_tasks_from_odd_estimates(db, project):
+    created, errors = agents._create_suggested_tasks(db, project.id, [
+        {"title": "Design", "estimated_days": "3"},
+        {"title": "Build", "estimated_days": 10 ** 12},
+        {"title": "Ship"},
+    ])
+    assert errors == []
+    assert [task["title"] for task in created] == ["Design", "Build", "Ship"]
+    deadlines = {task["title"]: datetime.fromisoformat(task["deadline"]) for task in created}
+    assert (deadlines["Build"] - deadlines["Design"]).days == agents.MAX_SUGGESTED_DAYS - 3
+
+
+def test_malformed_suggestion_creates_nothing(db, project):
+    created, errors = agents._create_suggested_tasks(db, project.id, [{"title": "Design"}, "not a task"])
+    assert created == []
+    assert [error["task"] for error in errors] == ["Design", "Unknown"]
+    assert db.scalar(select(func.count()).select_from(models.Task)) == 0